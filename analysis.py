@@ -0,0 +1,204 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Offline analysis of recorded Othello games.  Every game is replayed move by move and each position is
+#               searched to a fixed depth, grading each move against the best alternative and the score it lost.
+#               Games are spread over a process pool, results are appended to a JSON lines file as each game
+#               finishes, and an interrupted run picks up where it stopped.
+
+"""Run "python analysis.py games.oth results.jsonl --depth 4" on a game archive (see records.py) or on a JSON lines
+file with one game per line ({"moves": [[x, y], null, ...]}, null for a pass).  Each output line is one game:
+
+    {"game": 12, "players": {...}, "moves": [{"ply": 0, "color": "black", "move": [3, 4], "best": [3, 4],
+     "best_score": 15, "score": 15, "loss": 0, "exact": false}, ...], "loss": {"black": 40, "white": 95},
+     "disc_loss": {"black": 2, "white": 6}}
+
+Scores are from the point of view of the player to move.  Positions with more than endgame_empties blank squares
+are searched, and their scores are heuristic scores in search.py units; their losses add up to "loss".  Positions
+with endgame_empties blank squares or fewer are solved exactly (see endgame.py) and marked "exact": their scores
+are final disc differences, and their losses add up to "disc_loss" - the two units don't mix.
+
+"game" is the position of the game in the input, and results are written in finishing order.  A game that can't be
+replayed (an invalid move) is written as {"game": 12, "players": {...}, "error": "..."} so the rest of the run goes
+on.  Every line is flushed as soon as it is written, so the output file is also the checkpoint: running again with
+the same output file skips the games that are already in it, including the ones with errors."""
+
+import argparse
+import json
+import multiprocessing
+import os
+
+from bitboard import GAME_OVER_PIECES, legal_moves, square
+from endgame import EndgameSolver
+from othello import Othello
+from records import read_games
+from search import Search
+
+_worker = None                                      # the (Search, EndgameSolver) of this worker process
+
+
+def _init_worker(table_bits: int) -> None:
+    """Create the searchers of a worker process"""
+    global _worker
+    _worker = (Search(table_bits, endgame_empties=0), EndgameSolver())
+
+
+def read_moves(path: str):
+    """Stream the move sequences of a game archive (see records.py) or of a JSON lines file
+    :param str path: the input file - read as JSON lines if its name ends in .jsonl or .json
+    :return: a generator of (game number, players, moves) tuples, with None for a pass in moves"""
+    if path.endswith((".jsonl", ".json")):
+        with open(path) as file:
+            number = 0
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    moves = [None if move is None else (move[0], move[1]) for move in record["moves"]]
+                    yield number, record.get("players", {}), moves
+                    number += 1
+        return
+    for number, record in enumerate(read_games(path)):
+        yield number, record["players"], record["moves"]
+
+
+def analyse_game(moves: list, depth: int = 4, endgame_empties: int = 12, searcher: Search = None,
+                 solver: EndgameSolver = None) -> list:
+    """Replay a game with initialize_game and make_move and grade every move
+    :param list moves: the moves as (x, y) tuples, with None for a pass
+    :param int depth: the search depth for each position
+    :param int endgame_empties: positions with this many blank squares or fewer are solved exactly
+    :param Search searcher: the Search to use (a new one by default) - its table is cleared first
+    :param EndgameSolver solver: the EndgameSolver to use (a new one by default)
+    :return list: one dict per move (passes are skipped) with the "ply", "color", "move", the "best" move and its
+        "best_score", the "score" of the move played, the "loss" between the two and whether the position was
+        solved "exact" (scores in discs) or searched (scores in search.py units)"""
+    searcher = Search(endgame_empties=0) if searcher is None else searcher
+    solver = EndgameSolver() if solver is None else solver
+    searcher.clear()                                # results don't depend on the games searched before
+    game = Othello(engine="bitboard")
+    game.initialize_game()
+    color = 0
+    output = []
+    for ply, move in enumerate(moves):
+        name = "white" if color else "black"
+        color = 1 - color
+        if move is None:
+            continue
+        black, white = game.get_bitboards()
+        own, opp = (white, black) if color == 0 else (black, white)
+        if (black | white).bit_count() >= GAME_OVER_PIECES or not legal_moves(own, opp) >> square(*move) & 1:
+            raise ValueError(f"Move {ply} ({name} {move}) is not a valid move")
+        exact = 64 - (black | white).bit_count() <= endgame_empties
+        if exact:
+            best_score, best = solver.solve(black, white, 1 - color)
+        else:
+            best, best_score, completed = searcher.best_move(black, white, 1 - color, None, depth)
+        game.make_move(name, move)
+        if move == best:
+            score = best_score
+        else:
+            black, white = game.get_bitboards()
+            if exact:
+                score = -solver.solve(black, white, color)[0]
+            else:
+                score = -searcher.score(black, white, color, depth - 1)
+        output.append({"ply": ply, "color": name, "move": list(move), "best": list(best), "best_score": best_score,
+                       "score": score, "loss": max(0, best_score - score), "exact": exact})
+    return output
+
+
+def _analyse_task(task: tuple) -> dict:
+    """Grade one game in a worker process
+    :param tuple task: the game number, players, moves, depth and endgame_empties
+    :return dict: the output line for the game (see the module docstring)"""
+    number, players, moves, depth, endgame_empties = task
+    try:
+        graded = analyse_game(moves, depth, endgame_empties, *_worker)
+    except (ValueError, TypeError, IndexError) as error:   # a bad record must not end the whole run
+        return {"game": number, "players": players, "error": f"{type(error).__name__}: {error}"}
+    loss = {"black": 0, "white": 0}
+    disc_loss = {"black": 0, "white": 0}
+    for entry in graded:
+        (disc_loss if entry["exact"] else loss)[entry["color"]] += entry["loss"]
+    return {"game": number, "players": players, "moves": graded, "loss": loss, "disc_loss": disc_loss}
+
+
+def completed_games(path: str) -> set:
+    """Read the games already written to an output file.  A line cut short by an interrupted run is removed.
+    :param str path: the output file
+    :return set: the numbers of the games in the file"""
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb+") as file:
+        data = file.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):                         # the last line was never finished
+            file.truncate(end)
+    return {json.loads(line)["game"] for line in data[:end].splitlines() if line.strip()}
+
+
+def analyse(source: str, output: str, depth: int = 4, endgame_empties: int = 12, workers: int = None,
+            table_bits: int = 18):
+    """Grade every game of an input file over a process pool, appending each result to the output file as it
+        finishes.  Games already in the output file are skipped, so an interrupted run can be started again.
+    :param str source: the game archive or JSON lines file (see read_moves)
+    :param str output: the JSON lines output file
+    :param int depth: the search depth for each position
+    :param int endgame_empties: positions with this many blank squares or fewer are solved exactly
+    :param int workers: the number of worker processes (default: one per CPU core) - 1 grades in this process
+    :param int table_bits: each worker's transposition table has 2 ** table_bits slots
+    :return: a generator of the output dicts written by this run, in finishing order"""
+    done = completed_games(output)
+    tasks = ((number, players, moves, depth, endgame_empties) for number, players, moves in read_moves(source)
+             if number not in done)
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    with open(output, "a") as file:
+        if workers == 1:
+            _init_worker(table_bits)
+            results = map(_analyse_task, tasks)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(workers, _init_worker, (table_bits,))
+            results = pool.imap_unordered(_analyse_task, tasks)
+        try:
+            for result in results:
+                file.write(json.dumps(result, separators=(",", ":")) + "\n")
+                file.flush()
+                yield result
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+
+def main():
+    """Grade the games of an input file from the command line and print a summary"""
+    parser = argparse.ArgumentParser(description="Grade every move of recorded Othello games with a search.")
+    parser.add_argument("input", help="game archive, or JSON lines file with a \"moves\" list per line")
+    parser.add_argument("output", help="JSON lines file the results are appended to (resumed if it exists)")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--endgame-empties", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--table-bits", type=int, default=18)
+    args = parser.parse_args()
+    games = moves = errors = 0
+    loss = {"black": 0, "white": 0}
+    disc_loss = {"black": 0, "white": 0}
+    for result in analyse(args.input, args.output, args.depth, args.endgame_empties, args.workers, args.table_bits):
+        if "error" in result:
+            errors += 1
+            continue
+        games += 1
+        moves += len(result["moves"])
+        for color in loss:
+            loss[color] += result["loss"][color]
+            disc_loss[color] += result["disc_loss"][color]
+    games_or_one = max(games, 1)
+    print(f"games: {games}  moves: {moves}  errors: {errors}  average loss per game - "
+          f"black: {loss['black'] / games_or_one:.1f} + {disc_loss['black'] / games_or_one:.1f} discs  "
+          f"white: {loss['white'] / games_or_one:.1f} + {disc_loss['white'] / games_or_one:.1f} discs")
+
+
+if __name__ == "__main__":
+    main()
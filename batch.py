@@ -0,0 +1,166 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Batched move generation and move playing for many Othello boards at once with NumPy.  The same
+#               shift-and-mask operations as bitboard.py run on arrays of 64-bit boards, so a single call handles
+#               thousands of positions.  Requires numpy.
+
+"""Boards are passed around as a pair of uint64 arrays (black, white) with one entry per board, using the square
+numbering from bitboard.py (bit (x - 1) * 8 + (y - 1)).  from_arrays/to_arrays convert to and from (N, 8, 8) arrays
+holding the Othello.get_tile values (0 = black, 1 = white, 2 = blank).  Results match bitboard.legal_moves and
+bitboard.flip_mask - and so Othello.return_available_positions and Othello.make_move - board for board."""
+
+import numpy as np
+
+from bitboard import FULL, RAYS, SHIFTS
+
+_SHIFTS = [(np.uint64(abs(amount)), amount > 0, np.uint64(mask)) for amount, mask in SHIFTS]
+_RAYS = [(positive, np.array(rays, dtype=np.uint64)) for positive, rays in RAYS]
+_ONE = np.uint64(1)
+_ZERO = np.uint64(0)
+
+
+def _shift(bb, amount, left: bool, mask):
+    """Shift an array of bitboards one step in a direction (see bitboard.shift)"""
+    if left:
+        return (bb << amount) & mask
+    return (bb >> amount) & mask
+
+
+def from_arrays(boards) -> tuple:
+    """Convert an (N, 8, 8) array of tile values (0 = black, 1 = white, anything else blank) to bitboards
+    :param boards: the (N, 8, 8) array, indexed [board, x - 1, y - 1]
+    :return tuple: the black and white uint64 arrays"""
+    boards = np.asarray(boards).reshape(-1, 64)
+    black = np.packbits(boards == 0, axis=1, bitorder="little").view("<u8").ravel()
+    white = np.packbits(boards == 1, axis=1, bitorder="little").view("<u8").ravel()
+    return black.astype(np.uint64), white.astype(np.uint64)
+
+
+def to_arrays(black, white):
+    """Convert black and white bitboard arrays to an (N, 8, 8) array of tile values (0 = black, 1 = white,
+        2 = blank)
+    :param black: the uint64 array of black pieces
+    :param white: the uint64 array of white pieces
+    :return: the (N, 8, 8) int8 array"""
+    black = np.ascontiguousarray(black, dtype="<u8").view(np.uint8).reshape(-1, 8)
+    white = np.ascontiguousarray(white, dtype="<u8").view(np.uint8).reshape(-1, 8)
+    output = np.full((black.shape[0], 64), 2, dtype=np.int8)
+    output[np.unpackbits(black, axis=1, bitorder="little").astype(bool)] = 0
+    output[np.unpackbits(white, axis=1, bitorder="little").astype(bool)] = 1
+    return output.reshape(-1, 8, 8)
+
+
+def from_games(games: list) -> tuple:
+    """Convert a list of Othello objects to bitboard arrays
+    :param list games: the Othello objects
+    :return tuple: the black and white uint64 arrays"""
+    pairs = [game.get_bitboards() for game in games]
+    black = np.array([pair[0] for pair in pairs], dtype=np.uint64)
+    white = np.array([pair[1] for pair in pairs], dtype=np.uint64)
+    return black, white
+
+
+def split(black, white, colors) -> tuple:
+    """Return the (own, opp) arrays for the player to move on each board
+    :param black: the uint64 array of black pieces
+    :param white: the uint64 array of white pieces
+    :param colors: the player to move - 0 = black, 1 = white - as a scalar or one entry per board
+    :return tuple: the own and opp uint64 arrays"""
+    white_to_move = np.asarray(colors) == 1
+    return np.where(white_to_move, white, black), np.where(white_to_move, black, white)
+
+
+def legal_moves(own, opp):
+    """Return the legal move bitboard of every board (see bitboard.legal_moves)
+    :param own: the uint64 array of the moving player's pieces
+    :param opp: the uint64 array of the opposing player's pieces
+    :return: the uint64 array of legal moves"""
+    own = np.asarray(own, dtype=np.uint64)
+    opp = np.asarray(opp, dtype=np.uint64)
+    empty = ~(own | opp) & np.uint64(FULL)
+    moves = np.zeros_like(own)
+    for amount, left, mask in _SHIFTS:
+        line = opp & mask
+        run = _shift(own, amount, left, mask) & line
+        for _ in range(5):                  # a line can hold at most six opposing pieces
+            run |= _shift(run, amount, left, mask) & line
+        moves |= _shift(run, amount, left, mask)
+    return moves & empty
+
+
+def flip_masks(own, opp, squares):
+    """Return the pieces flipped by playing a square on every board (see bitboard.flip_mask).  In each direction
+        the scan stops at the first piece of the player's own color and every opposing piece in between flips.
+    :param own: the uint64 array of the moving player's pieces
+    :param opp: the uint64 array of the opposing player's pieces
+    :param squares: the bit index of the move on each board, or -1 for a board that passes
+    :return: the uint64 array of flipped pieces"""
+    own = np.asarray(own, dtype=np.uint64)
+    opp = np.asarray(opp, dtype=np.uint64)
+    squares = np.asarray(squares)
+    playing = squares >= 0
+    index = np.maximum(squares, 0)
+    flips = np.zeros_like(own)
+    for positive, rays in _RAYS:
+        ray = np.where(playing, rays[index], _ZERO)
+        hits = ray & own
+        if positive:
+            # the nearest own piece is the lowest bit - the squares below it are in between
+            between = ray & ((hits & (~hits + _ONE)) - _ONE)
+        else:
+            # the nearest own piece is the highest bit - smear it down, the squares above it are in between
+            for amount in (1, 2, 4, 8, 16, 32):
+                hits |= hits >> np.uint64(amount)
+            between = ray & ~hits
+        flips |= np.where(hits != 0, between & opp, _ZERO)
+    return flips
+
+
+def make_moves(black, white, colors, squares) -> tuple:
+    """Play one move on every board and return the successor boards
+    :param black: the uint64 array of black pieces
+    :param white: the uint64 array of white pieces
+    :param colors: the player to move - 0 = black, 1 = white - as a scalar or one entry per board
+    :param squares: the bit index of the move on each board, or -1 for a board that passes
+    :return tuple: the new black and white uint64 arrays"""
+    black = np.asarray(black, dtype=np.uint64)
+    white = np.asarray(white, dtype=np.uint64)
+    squares = np.asarray(squares)
+    white_to_move = np.broadcast_to(np.asarray(colors) == 1, black.shape)
+    own, opp = split(black, white, white_to_move)
+    flips = flip_masks(own, opp, squares)
+    placed = np.where(squares >= 0, _ONE << np.maximum(squares, 0).astype(np.uint64), _ZERO) | flips
+    own = own | placed
+    opp = opp & ~placed
+    return np.where(white_to_move, opp, own), np.where(white_to_move, own, opp)
+
+
+def neighbours(bb):
+    """Return the squares next to a square of each bitboard (see bitboard.neighbours)
+    :param bb: a uint64 array
+    :return: the uint64 array of neighbouring squares"""
+    bb = np.asarray(bb, dtype=np.uint64)
+    output = np.zeros_like(bb)
+    for amount, left, mask in _SHIFTS:
+        output |= _shift(bb, amount, left, mask)
+    return output
+
+
+def popcount(bb):
+    """Return the number of pieces in each bitboard
+    :param bb: a uint64 array
+    :return: an int array of counts"""
+    bb = np.asarray(bb, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):        # numpy 2.0 and later
+        return np.bitwise_count(bb)
+    bytes_ = np.ascontiguousarray(bb, dtype="<u8").view(np.uint8).reshape(bb.shape + (8,))
+    return np.unpackbits(bytes_, axis=-1).sum(axis=-1)
+
+
+def winner_counts(black, white) -> tuple:
+    """Return the black and white piece counts of every board (see Othello.return_winner_count)
+    :param black: the uint64 array of black pieces
+    :param white: the uint64 array of white pieces
+    :return tuple: the black and white count arrays"""
+    return popcount(black), popcount(white)
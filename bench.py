@@ -0,0 +1,283 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Benchmark and regression suite for the Othello engines.  Counts perft leaf nodes from the starting
+#               position to check move generation, times the board methods on a fixed corpus of mid-game positions,
+#               and compares throughput against a stored baseline.
+
+"""Run with "python bench.py".  The perft counts in PERFT are checked on every run.  Save a baseline for the current
+machine with --save, and later runs fail (exit status 1) when any throughput drops by more than --threshold.
+
+PERFT holds the counts for this project's rules.  flip_piece keeps scanning past blank Tiles to the first piece of
+the player's own color, so some moves flip pieces that standard Othello would not, and from depth 6 on the counts
+are lower than the published Othello perft counts (8160 instead of 8200 at depth 6)."""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from bitboard import flip_mask, legal_moves
+from othello import Othello
+
+# leaf counts from the starting position - a turn with no valid moves counts as a ply, and a finished game is a leaf
+PERFT = {1: 4, 2: 12, 3: 56, 4: 244, 5: 1396, 6: 8160, 7: 54712, 8: 382896, 9: 2931756}
+
+ENGINES = ("tiles", "bitboard")
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+
+def perft(game: Othello, color: str, depth: int, passed: bool = False) -> int:
+    """Count the leaf nodes of the game tree to a depth, walking it with make_move_record and unmake_move
+    :param Othello game: the game to search (restored before returning)
+    :param str color: the color of the player to move
+    :param int depth: the number of plies to search
+    :param bool passed: True if the previous player had no valid moves
+    :return int: the number of leaf nodes"""
+    if depth == 0:
+        return 1
+    other = "white" if color == "black" else "black"
+    moves = game.return_available_positions(color)
+    if not moves:
+        if passed:                                  # neither player can move - the game is over
+            return 1
+        return perft(game, other, depth - 1, True)
+    if depth == 1:
+        return len(moves)
+    total = 0
+    for move in moves:
+        record = game.make_move_record(color, move)
+        total += perft(game, other, depth - 1)
+        game.unmake_move(record)
+    return total
+
+
+def perft_bitboard(own: int, opp: int, depth: int, passed: bool = False) -> int:
+    """Count the leaf nodes of the game tree to a depth directly on bitboards (see perft)
+    :param int own: the bitboard of the player to move
+    :param int opp: the bitboard of the opponent
+    :param int depth: the number of plies to search
+    :param bool passed: True if the previous player had no valid moves
+    :return int: the number of leaf nodes"""
+    if depth == 0:
+        return 1
+    moves = legal_moves(own, opp)
+    if not moves:
+        if passed:
+            return 1
+        return perft_bitboard(opp, own, depth - 1, True)
+    if depth == 1:
+        return moves.bit_count()
+    total = 0
+    while moves:
+        low = moves & -moves
+        moves ^= low
+        flips = flip_mask(own, opp, low.bit_length() - 1)
+        total += perft_bitboard(opp & ~flips, own | flips | low, depth - 1)
+    return total
+
+
+def corpus(size: int = 50, seed: int = 2023) -> list:
+    """Return a fixed corpus of mid-game positions as move sequences from the starting position.  Each sequence
+        is between 16 and 40 random moves long, and the same seed always gives the same corpus.
+    :param int size: the number of positions
+    :param int seed: the random seed
+    :return list: (moves, color to move) pairs, where moves holds (color, (x, y)) pairs"""
+    rng = random.Random(seed)
+    output = []
+    while len(output) < size:
+        game = Othello(engine="bitboard")
+        color = "black"
+        moves = []
+        for _ in range(rng.randrange(16, 41)):
+            available = game.return_available_positions(color)
+            if not available:
+                color = "white" if color == "black" else "black"
+                available = game.return_available_positions(color)
+                if not available:
+                    break
+            move = rng.choice(available)
+            game.make_move_delta(color, move)
+            moves.append((color, move))
+            color = "white" if color == "black" else "black"
+        if game.return_available_positions(color):
+            output.append((moves, color))
+    return output
+
+
+def replay(moves: list, engine: str) -> Othello:
+    """Return a new game with a move sequence from corpus played on it
+    :param list moves: (color, (x, y)) pairs
+    :param str engine: the Othello engine to play on
+    :return Othello: the game"""
+    game = Othello(engine=engine)
+    for color, move in moves:
+        game.make_move_delta(color, move)
+    return game
+
+
+def _summary(samples: list) -> dict:
+    """Return the call count, mean and median latency (in microseconds) and calls per second of timing samples"""
+    samples = sorted(samples)
+    total = sum(samples)
+    return {"calls": len(samples), "mean_us": total / len(samples) * 1e6,
+            "p50_us": samples[len(samples) // 2] * 1e6, "per_sec": len(samples) / total if total else 0.0}
+
+
+def time_methods(engine: str, positions: list, repeat: int = 20) -> dict:
+    """Time the board methods of an engine on every corpus position
+    :param str engine: the Othello engine to time
+    :param list positions: the corpus from corpus()
+    :param int repeat: the number of timed calls per position for the methods that do not change the board
+    :return dict: method name: summary dict (see _summary)"""
+    clock = time.perf_counter
+    samples = {"return_available_positions": [], "return_available_positions (cached)": [], "make_move": [],
+               "board_to_list": [], "return_winner_count": []}
+    if engine == "tiles":
+        samples["positions_helper"] = []
+    directions = [[1, 0], [1, 1], [0, 1], [-1, 1], [0, -1], [-1, -1], [-1, 0], [1, -1]]
+    for moves, color in positions:
+        game = replay(moves, engine)
+        start = clock()                             # first query after the moves fills the move cache
+        available = game.return_available_positions(color)
+        samples["return_available_positions"].append(clock() - start)
+        for _ in range(repeat):
+            start = clock()
+            game.return_available_positions(color)
+            samples["return_available_positions (cached)"].append(clock() - start)
+            start = clock()
+            game.board_to_list()
+            samples["board_to_list"].append(clock() - start)
+            start = clock()
+            game.return_winner_count()
+            samples["return_winner_count"].append(clock() - start)
+        if engine == "tiles":
+            value = 0 if color == "black" else 1
+            for x in range(1, 9):
+                for y in range(1, 9):
+                    if game.get_tile(x, y) == value:
+                        for direction in directions:
+                            start = clock()
+                            game.positions_helper(x, y, direction, value)
+                            samples["positions_helper"].append(clock() - start)
+        for move in available:
+            game = replay(moves, engine)
+            start = clock()
+            game.make_move(color, move)
+            samples["make_move"].append(clock() - start)
+    return {name: _summary(values) for name, values in samples.items()}
+
+
+def time_perft(engine: str, depth: int) -> dict:
+    """Run perft from the starting position through the Othello methods and time it
+    :param str engine: the Othello engine to search
+    :param int depth: the perft depth
+    :return dict: the "depth", leaf "nodes", "seconds" and "nodes_per_sec" """
+    game = Othello(engine=engine)
+    start = time.perf_counter()
+    nodes = perft(game, "black", depth)
+    seconds = time.perf_counter() - start
+    return {"depth": depth, "nodes": nodes, "seconds": seconds, "nodes_per_sec": nodes / seconds}
+
+
+def run(perft_depth: int = 6, bitboard_depth: int = 8, size: int = 50, repeat: int = 20) -> dict:
+    """Run the whole suite
+    :return dict: the results, as {"perft": {...}, "methods": {engine: {...}}, "errors": [...]}"""
+    results = {"perft": {}, "methods": {}, "errors": []}
+    for engine in ENGINES:
+        results["perft"][engine] = time_perft(engine, perft_depth)
+    game = Othello(engine="bitboard")
+    black, white = game.get_bitboards()
+    start = time.perf_counter()
+    nodes = perft_bitboard(black, white, bitboard_depth)
+    seconds = time.perf_counter() - start
+    results["perft"]["raw bitboard"] = {"depth": bitboard_depth, "nodes": nodes, "seconds": seconds,
+                                        "nodes_per_sec": nodes / seconds}
+    for name, result in results["perft"].items():
+        expected = PERFT.get(result["depth"])
+        if expected is not None and result["nodes"] != expected:
+            results["errors"].append(f"perft({result['depth']}) with {name}: {result['nodes']} nodes, "
+                                     f"expected {expected}")
+    positions = corpus(size)
+    for engine in ENGINES:
+        results["methods"][engine] = time_methods(engine, positions, repeat)
+    return results
+
+
+def throughputs(results: dict) -> dict:
+    """Return the flat name: per-second throughput dict that baselines store
+    :param dict results: the results from run
+    :return dict: the throughputs"""
+    output = {}
+    for name, result in results["perft"].items():
+        output[f"perft {name}"] = result["nodes_per_sec"]
+    for engine, methods in results["methods"].items():
+        for name, summary in methods.items():
+            output[f"{engine} {name}"] = summary["per_sec"]
+    return output
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Return an error message for every throughput that dropped more than threshold below the baseline
+    :param dict current: the current throughputs
+    :param dict baseline: the baseline throughputs
+    :param float threshold: the allowed fractional drop (0.25 = 25% slower)
+    :return list: the error messages"""
+    errors = []
+    for name, value in baseline.items():
+        if name in current and current[name] < value * (1 - threshold):
+            errors.append(f"{name}: {current[name]:,.0f}/s is {1 - current[name] / value:.0%} below the baseline "
+                          f"of {value:,.0f}/s")
+    return errors
+
+
+def report(results: dict) -> None:
+    """Print the results as a table
+    :return: None"""
+    print("perft")
+    for name, result in results["perft"].items():
+        print(f"  {name:<14} depth {result['depth']}  {result['nodes']:>10,} nodes  {result['seconds']:8.3f} s  "
+              f"{result['nodes_per_sec']:>12,.0f} nodes/s")
+    for engine, methods in results["methods"].items():
+        print(f"{engine} engine")
+        for name, summary in methods.items():
+            print(f"  {name:<38} {summary['calls']:>7,} calls  mean {summary['mean_us']:9.2f} us  "
+                  f"p50 {summary['p50_us']:9.2f} us  {summary['per_sec']:>12,.0f} /s")
+    return
+
+
+def main():
+    """Run the suite from the command line"""
+    parser = argparse.ArgumentParser(description="Benchmark the Othello engines.")
+    parser.add_argument("--perft-depth", type=int, default=6, help="perft depth through the Othello methods")
+    parser.add_argument("--bitboard-depth", type=int, default=8, help="perft depth directly on bitboards")
+    parser.add_argument("--positions", type=int, default=50, help="number of corpus positions")
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per position")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file")
+    parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed throughput drop (0.25 = 25%%)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+    results = run(args.perft_depth, args.bitboard_depth, args.positions, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        report(results)
+    errors = list(results["errors"])
+    current = throughputs(results)
+    if args.save:
+        with open(args.baseline, "w") as file:
+            json.dump(current, file, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            errors.extend(compare(current, json.load(file), args.threshold))
+    for error in errors:
+        print(f"FAIL {error}", file=sys.stderr)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Bitboard engine for the Othello class.  The board is stored as two 64-bit integers (one for the
+#               black pieces and one for the white pieces) and moves are generated and played with shift-and-mask
+#               operations instead of walking the Tile array.  Select it with Othello(engine="bitboard").
+
+"""Square numbering: the playable [x, y] coordinates 1-8 of the Othello board (x = row, y = column, starting from
+the top left corner) map to bit (x - 1) * 8 + (y - 1), so iterating the set bits from lowest to highest visits the
+squares in the same sorted order that Othello.return_available_positions returns them in.
+
+Other board sizes (see Geometry) number their squares the same way with rows of size bits, (x - 1) * size + (y - 1),
+and use Python integers as size * size bit wide bitsets.  The module level functions are the 8x8 versions - the
+search and the endgame solver only play 8x8 boards."""
+
+FULL = 0xFFFFFFFFFFFFFFFF
+NOT_LEFT = 0xFEFEFEFEFEFEFEFE       # every square except column y = 1
+NOT_RIGHT = 0x7F7F7F7F7F7F7F7F      # every square except column y = 8
+GAME_OVER_PIECES = 62               # Othello.auto ends the game when 62 pieces have been played
+
+# the eight directions in the same order as Othello.make_move, as (x, y) steps
+DIRECTIONS = [[1, 0], [1, 1], [0, 1], [-1, 1], [0, -1], [-1, -1], [-1, 0], [1, -1]]
+
+
+def _shift_for(direction: list) -> tuple:
+    """Return the bit shift and wrap-around mask for a single [x, y] direction
+    :param list direction: the x,y step of the direction
+    :return amount, mask: the signed number of bits to shift and the mask to apply after shifting"""
+    amount = direction[0] * 8 + direction[1]
+    if direction[1] == 1:
+        mask = NOT_LEFT             # moving right must not wrap onto the left column of the next row
+    elif direction[1] == -1:
+        mask = NOT_RIGHT            # moving left must not wrap onto the right column of the previous row
+    else:
+        mask = FULL
+    return amount, mask
+
+
+SHIFTS = [_shift_for(direction) for direction in DIRECTIONS]
+
+
+def shift(bb: int, amount: int, mask: int) -> int:
+    """Shift every square of a bitboard one step in a direction, dropping squares that leave the board
+    :param int bb: the bitboard to shift
+    :param int amount: the signed bit shift for the direction (from SHIFTS)
+    :param int mask: the wrap-around mask for the direction (from SHIFTS)
+    :return int: the shifted bitboard"""
+    if amount > 0:
+        return (bb << amount) & mask
+    return (bb >> -amount) & mask
+
+
+def _build_rays() -> list:
+    """Build the ray table: for each direction, the mask of squares from each square (exclusive) to the edge
+    :return list: (positive, rays) pairs in DIRECTIONS order - positive is True when the ray moves to higher bits"""
+    table = []
+    for amount, mask in SHIFTS:
+        rays = []
+        for index in range(64):
+            ray = 0
+            bb = shift(1 << index, amount, mask)
+            while bb:
+                ray |= bb
+                bb = shift(bb, amount, mask)
+            rays.append(ray)
+        table.append((amount > 0, rays))
+    return table
+
+
+RAYS = _build_rays()
+
+
+def square(x: int, y: int) -> int:
+    """Return the bit index of an [x, y] board coordinate
+    :param int x: the x coordinate (1-8)
+    :param int y: the y coordinate (1-8)
+    :return int: the bit index (0-63)"""
+    return (x - 1) * 8 + (y - 1)
+
+
+def coord(index: int) -> tuple:
+    """Return the (x, y) board coordinate of a bit index
+    :param int index: the bit index (0-63)
+    :return tuple: the (x, y) coordinate"""
+    return index // 8 + 1, index % 8 + 1
+
+
+def legal_moves(own: int, opp: int) -> int:
+    """Return the bitboard of every empty square that brackets at least one line of opposing pieces -
+        the same squares Othello.positions_helper finds by walking out from each of the player's pieces
+    :param int own: the bitboard of the moving player's pieces
+    :param int opp: the bitboard of the opposing player's pieces
+    :return int: the bitboard of legal moves"""
+    empty = ~(own | opp) & FULL
+    moves = 0
+    for amount, mask in SHIFTS:             # shifts are written out inline - this is the hottest loop in the game
+        line = opp & mask                   # a line can hold at most six opposing pieces, so six steps cover it
+        if amount > 0:
+            run = (own << amount) & line
+            run |= (run << amount) & line
+            run |= (run << amount) & line
+            run |= (run << amount) & line
+            run |= (run << amount) & line
+            run |= (run << amount) & line
+            moves |= (run << amount) & mask
+        else:
+            amount = -amount
+            run = (own >> amount) & line
+            run |= (run >> amount) & line
+            run |= (run >> amount) & line
+            run |= (run >> amount) & line
+            run |= (run >> amount) & line
+            run |= (run >> amount) & line
+            moves |= (run >> amount) & mask
+    return moves & empty
+
+
+def flip_mask(own: int, opp: int, index: int) -> int:
+    """Return the bitboard of opposing pieces flipped by playing on a square.  Mirrors Othello.flip_piece: in each
+        direction the scan stops at the first piece of the player's own color before the edge of the board and
+        every opposing piece in between is flipped.
+    :param int own: the bitboard of the moving player's pieces
+    :param int opp: the bitboard of the opposing player's pieces
+    :param int index: the bit index of the played square
+    :return int: the bitboard of pieces to flip"""
+    flips = 0
+    for positive, rays in RAYS:
+        ray = rays[index]
+        hits = ray & own
+        if hits:
+            if positive:
+                nearest = (hits & -hits).bit_length() - 1
+            else:
+                nearest = hits.bit_length() - 1
+            flips |= (ray ^ rays[nearest] ^ (1 << nearest)) & opp
+    return flips
+
+
+def to_list(bb: int) -> list:
+    """Return a sorted list of the (x, y) coordinates of every square set in a bitboard
+    :param int bb: the bitboard
+    :return list: the sorted list of tuple coordinates"""
+    output = []
+    while bb:
+        low = bb & -bb
+        output.append(coord(low.bit_length() - 1))
+        bb ^= low
+    return output
+
+
+def neighbours(bb: int) -> int:
+    """Return the squares next to (in any of the eight directions) a square of a bitboard
+    :param int bb: the bitboard
+    :return int: the bitboard of neighbouring squares"""
+    output = 0
+    for amount, mask in SHIFTS:
+        output |= shift(bb, amount, mask)
+    return output
+
+
+class Geometry:
+    """Represents the bit layout of a size x size board: the shifts, masks and ray tables used to generate and
+        play moves on size * size bit integers.  Boards other than 8x8 find moves with a doubling (Kogge-Stone)
+        fill, which takes a few big-integer shifts per direction however large the board is.  Use geometry(size)
+        to share one Geometry per size.
+    :param int size: the number of rows and columns
+    :ivar int full: every square of the board
+    :ivar int game_over_pieces: the piece count that ends the game (all but two squares, 62 on 8x8)
+    :ivar legal_moves: legal_moves(own, opp) for this board size
+    :ivar flip_mask: flip_mask(own, opp, index) for this board size
+    """
+    __slots__ = ("size", "full", "shifts", "rays", "game_over_pieces", "legal_moves", "flip_mask")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.full = (1 << size * size) - 1
+        left = sum(1 << row * size for row in range(size))              # column y = 1
+        right = left << (size - 1)                                      # column y = size
+        self.shifts = []
+        for direction in DIRECTIONS:
+            mask = self.full
+            if direction[1] == 1:
+                mask ^= left
+            elif direction[1] == -1:
+                mask ^= right
+            self.shifts.append((direction[0] * size + direction[1], mask))
+        self.rays = []
+        for amount, mask in self.shifts:
+            rays = []
+            for index in range(size * size):
+                ray = 0
+                bb = shift(1 << index, amount, mask) & self.full
+                while bb:
+                    ray |= bb
+                    bb = shift(bb, amount, mask) & self.full
+                rays.append(ray)
+            self.rays.append((amount > 0, rays))
+        self.game_over_pieces = size * size - 2
+        if size == 8:                                   # the unrolled 64-bit versions
+            self.legal_moves, self.flip_mask = legal_moves, flip_mask
+        else:
+            self.legal_moves, self.flip_mask = self._legal_moves, self._flip_mask
+
+    def square(self, x: int, y: int) -> int:
+        """Return the bit index of an [x, y] board coordinate
+        :param int x: the x coordinate (1-size)
+        :param int y: the y coordinate (1-size)
+        :return int: the bit index"""
+        return (x - 1) * self.size + (y - 1)
+
+    def coord(self, index: int) -> tuple:
+        """Return the (x, y) board coordinate of a bit index
+        :param int index: the bit index
+        :return tuple: the (x, y) coordinate"""
+        return index // self.size + 1, index % self.size + 1
+
+    def to_list(self, bb: int) -> list:
+        """Return a sorted list of the (x, y) coordinates of every square set in a bitboard
+        :param int bb: the bitboard
+        :return list: the sorted list of tuple coordinates"""
+        size = self.size
+        output = []
+        while bb:
+            low = bb & -bb
+            index = low.bit_length() - 1
+            output.append((index // size + 1, index % size + 1))
+            bb ^= low
+        return output
+
+    def start(self) -> tuple:
+        """Return the starting position - the four centre squares, as on 8x8
+        :return tuple: the black and white bitboards"""
+        middle = self.size // 2
+        black = (1 << self.square(middle, middle + 1)) | (1 << self.square(middle + 1, middle))
+        white = (1 << self.square(middle, middle)) | (1 << self.square(middle + 1, middle + 1))
+        return black, white
+
+    def _legal_moves(self, own: int, opp: int) -> int:
+        """legal_moves for any board size: in each direction, fill out from the player's pieces over the opposing
+            pieces next to them, doubling the step each time, then step once more onto the empty squares"""
+        empty = ~(own | opp) & self.full
+        reach = self.size - 3                           # the longest line of opposing pieces, less the first one
+        moves = 0
+        for amount, mask in self.shifts:
+            line = opp & mask
+            if amount > 0:
+                run = (own << amount) & line
+                step, covered = amount, 0
+                while covered < reach:
+                    run |= (run << step) & line
+                    line &= line << step
+                    covered = 2 * covered + 1
+                    step *= 2
+                moves |= (run << amount) & mask
+            else:
+                amount = -amount
+                run = (own >> amount) & line
+                step, covered = amount, 0
+                while covered < reach:
+                    run |= (run >> step) & line
+                    line &= line >> step
+                    covered = 2 * covered + 1
+                    step *= 2
+                moves |= (run >> amount) & mask
+        return moves & empty
+
+    def _flip_mask(self, own: int, opp: int, index: int) -> int:
+        """flip_mask for any board size (see flip_mask)"""
+        flips = 0
+        for positive, rays in self.rays:
+            ray = rays[index]
+            hits = ray & own
+            if hits:
+                if positive:
+                    nearest = (hits & -hits).bit_length() - 1
+                else:
+                    nearest = hits.bit_length() - 1
+                flips |= (ray ^ rays[nearest] ^ (1 << nearest)) & opp
+        return flips
+
+
+_GEOMETRIES = {}
+
+
+def geometry(size: int = 8) -> Geometry:
+    """Return the shared Geometry of a board size, building it on first use
+    :param int size: the number of rows and columns
+    :return Geometry: the geometry"""
+    layout = _GEOMETRIES.get(size)
+    if layout is None:
+        layout = _GEOMETRIES[size] = Geometry(size)
+    return layout
+
+
+class BitboardEngine:
+    """Represents the state of an Othello board as two integers - 64-bit on the standard 8x8 board, size * size
+        bits on other sizes (see Geometry).  Implements the board methods of the Othello class
+        (return_available_positions, make_move, return_winner_count, print_board and board_to_list) with the same
+        inputs and outputs, so an Othello object built with engine="bitboard" can hand them off to this class.
+    :param int size: the number of rows and columns of the board
+    :ivar int black: the bitboard of black pieces
+    :ivar int white: the bitboard of white pieces
+    :ivar dict moves: cached return_available_positions lists for the current position, as color: list
+    :ivar Geometry geometry: the bit layout of the board
+    """
+    __slots__ = ("black", "white", "moves", "geometry")
+
+    def __init__(self, size: int = 8):
+        # same starting positions as Othello.initialize_game
+        self.geometry = geometry(size)
+        self.black, self.white = self.geometry.start()
+        self.moves = {}
+
+    def get_tile(self, x: int, y: int) -> int:
+        """Return the integer value of a board coordinate, matching Othello.get_tile
+        :param int x: the x coordinate (0 to size + 1, including the border)
+        :param int y: the y coordinate (0 to size + 1, including the border)
+        :return int: 0 = black, 1 = white, 2 = blank, 3 = border"""
+        size = self.geometry.size
+        if x < 1 or x > size or y < 1 or y > size:
+            return 3
+        bit = 1 << self.geometry.square(x, y)
+        if self.black & bit:
+            return 0
+        if self.white & bit:
+            return 1
+        return 2
+
+    def return_available_positions(self, color: str) -> list:
+        """Return a sorted list of possible positions for the player with the given color
+        :param str color: the color of the current player
+        :return list: a list of tuple coordinates for valid moves"""
+        color = color.lower() == "black"
+        moves = self.moves.get(color)
+        if moves is None:
+            layout = self.geometry
+            if color:
+                moves = layout.to_list(layout.legal_moves(self.black, self.white))
+            else:
+                moves = layout.to_list(layout.legal_moves(self.white, self.black))
+            self.moves[color] = moves
+        return list(moves)
+
+    def make_move(self, color: str, piece_position: tuple) -> list:
+        """Place a piece of the given color and flip the opposing pieces, assuming the move is valid
+        :param str color: the color of the current player (black or white)
+        :param tuple piece_position: the (x, y) coordinate of the move position
+        :return list: the current state of the board (see board_to_list)"""
+        self.make_move_delta(color, piece_position)
+        return self.board_to_list()
+
+    def make_move_delta(self, color: str, piece_position: tuple) -> list:
+        """Place a piece of the given color and flip the opposing pieces, assuming the move is valid
+        :param str color: the color of the current player (black or white)
+        :param tuple piece_position: the (x, y) coordinate of the move position
+        :return list: the (x, y) coordinates of the played piece followed by the flipped pieces"""
+        layout = self.geometry
+        index = layout.square(piece_position[0], piece_position[1])
+        bit = 1 << index
+        if color.lower() == "black":
+            flips = layout.flip_mask(self.black, self.white, index)
+            self.black |= bit | flips
+            self.white &= ~(bit | flips)
+        else:
+            flips = layout.flip_mask(self.white, self.black, index)
+            self.white |= bit | flips
+            self.black &= ~(bit | flips)
+        self.moves = {}
+        return [(piece_position[0], piece_position[1])] + layout.to_list(flips)
+
+    def unmake_move_delta(self, color: str, changed: list) -> None:
+        """Take back a move from the changed squares make_move_delta returned for it
+        :param str color: the color of the player that made the move (black or white)
+        :param list changed: the (x, y) coordinates of the played piece followed by the flipped pieces
+        :return: None"""
+        square_of = self.geometry.square
+        bit = 1 << square_of(changed[0][0], changed[0][1])
+        flips = 0
+        for x, y in changed[1:]:
+            flips |= 1 << square_of(x, y)
+        if color.lower() == "black":
+            self.black &= ~(bit | flips)
+            self.white |= flips
+        else:
+            self.white &= ~(bit | flips)
+            self.black |= flips
+        self.moves = {}
+        return
+
+    def count_flips(self, color: str, piece_position: tuple) -> int:
+        """Return the number of pieces a move would flip without playing it
+        :param str color: the color of the current player (black or white)
+        :param tuple piece_position: the (x, y) coordinate of the move position
+        :return int: the number of pieces that would be flipped"""
+        layout = self.geometry
+        index = layout.square(piece_position[0], piece_position[1])
+        if color.lower() == "black":
+            return layout.flip_mask(self.black, self.white, index).bit_count()
+        return layout.flip_mask(self.white, self.black, index).bit_count()
+
+    def return_winner_count(self) -> tuple:
+        """Return the current number of black and white pieces on the board
+        :return black_count, white_count"""
+        return self.black.bit_count(), self.white.bit_count()
+
+    def board_to_list(self) -> list:
+        """Return a nested (size + 2) x (size + 2) list of symbols (including the border) for the current board
+        :return list output: a nested list matrix of the current state of the board"""
+        size = self.geometry.size
+        output = [["*"] * (size + 2)]
+        for row in range(0, size * size, size):
+            black, white = self.black >> row, self.white >> row
+            nested = ["*"]
+            for column in range(size):
+                if black >> column & 1:
+                    nested.append("X")
+                elif white >> column & 1:
+                    nested.append("O")
+                else:
+                    nested.append(".")
+            nested.append("*")
+            output.append(nested)
+        output.append(["*"] * (size + 2))
+        return output
+
+    def print_board(self) -> None:
+        """Print the current board to the console (including the border)
+        :return: None"""
+        for nested in self.board_to_list():
+            print("".join(f" {symbol} " for symbol in nested))
+        return
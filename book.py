@@ -0,0 +1,238 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Opening book for the Othello class.  Positions from the first plies of recorded games are reduced
+#               to one canonical form under the 8 symmetries of the board and stored with their best known move in
+#               an on-disk hash table, so an early-game move costs one lookup instead of a search.
+
+"""Build a book from a game archive (see records.py) with build_book, then plug it into a game with BookPolicy:
+
+    game.auto(computer="white", policy=BookPolicy("book.bin"))
+
+Book file layout: MAGIC, the number of slots (a power of two) and the number of entries, followed by the slots.
+Each slot holds a canonical position (black and white bitboards and the color to move), its best known move in
+canonical orientation, the number of games that played it and their summed score for the player to move (2 for a
+win, 1 for a tie, 0 for a loss).  A slot with both bitboards 0 is empty.  Lookups hash the position to a slot and
+probe forward, and since the table is at most half full a lookup reads one or two slots."""
+
+import mmap
+import struct
+
+from bitboard import coord, flip_mask, square
+from records import read_games
+from search import SearchPolicy
+
+MAGIC = b"OBK1"
+FILE_HEADER = struct.Struct("<4sII")
+SLOT = struct.Struct("<QQBBxxIi")
+MASK64 = 0xFFFFFFFFFFFFFFFF
+
+# the 8 symmetries of the board as functions of (row, column) - rows and columns numbered 0-7
+SYMMETRIES = [
+    lambda r, c: (r, c), lambda r, c: (r, 7 - c), lambda r, c: (7 - r, c), lambda r, c: (7 - r, 7 - c),
+    lambda r, c: (c, r), lambda r, c: (c, 7 - r), lambda r, c: (7 - c, r), lambda r, c: (7 - c, 7 - r),
+]
+
+
+def _symmetry_tables() -> tuple:
+    """Build the square permutation of each symmetry, its inverse, and byte tables for transforming bitboards
+    :return tuple: permutations, inverse permutations, and tables[symmetry][row][byte] -> transformed bitboard"""
+    permutations = []
+    for symmetry in SYMMETRIES:
+        permutations.append([symmetry(index // 8, index % 8)[0] * 8 + symmetry(index // 8, index % 8)[1]
+                             for index in range(64)])
+    inverses = []
+    for permutation in permutations:
+        inverse = [0] * 64
+        for index, target in enumerate(permutation):
+            inverse[target] = index
+        inverses.append(inverse)
+    tables = []
+    for permutation in permutations:
+        rows = []
+        for row in range(8):
+            values = []
+            for value in range(256):
+                bb = 0
+                for bit in range(8):
+                    if value >> bit & 1:
+                        bb |= 1 << permutation[row * 8 + bit]
+                values.append(bb)
+            rows.append(values)
+        tables.append(rows)
+    return permutations, inverses, tables
+
+
+PERMUTATIONS, INVERSES, TABLES = _symmetry_tables()
+
+
+def transform(bb: int, symmetry: int) -> int:
+    """Return a bitboard transformed by one of the 8 symmetries
+    :param int bb: the bitboard
+    :param int symmetry: the index of the symmetry in SYMMETRIES
+    :return int: the transformed bitboard"""
+    rows = TABLES[symmetry]
+    return (rows[0][bb & 255] | rows[1][bb >> 8 & 255] | rows[2][bb >> 16 & 255] | rows[3][bb >> 24 & 255] |
+            rows[4][bb >> 32 & 255] | rows[5][bb >> 40 & 255] | rows[6][bb >> 48 & 255] | rows[7][bb >> 56])
+
+
+def canonical(black: int, white: int) -> tuple:
+    """Return the canonical form of a position - the smallest (black, white) pair over the 8 symmetries
+    :param int black: the bitboard of black pieces
+    :param int white: the bitboard of white pieces
+    :return tuple: the canonical black and white bitboards and the index of the symmetry that produces them"""
+    best = None
+    for symmetry in range(8):
+        candidate = (transform(black, symmetry), transform(white, symmetry), symmetry)
+        if best is None or candidate < best:
+            best = candidate
+    return best
+
+
+def _slot(black: int, white: int, color: int, mask: int) -> int:
+    """Return the home slot of a canonical position"""
+    key = ((black * 0x9E3779B97F4A7C15) ^ (white * 0xC2B2AE3D27D4EB4F) ^ color) & MASK64
+    return (key >> 32 ^ key) & mask
+
+
+def collect(games, max_plies: int = 20) -> dict:
+    """Collect move statistics for the canonical positions of the first plies of recorded games
+    :param games: an iterable of game dicts from records.read_games
+    :param int max_plies: the number of plies from the start of each game to collect
+    :return dict: (black, white, color): {canonical move index: [games, score]} where score counts 2 for a win
+        and 1 for a tie for the player to move - the canonical move is the smallest image of the move under the
+        symmetries that give the canonical position"""
+    stats = {}
+    for record in games:
+        diff = record["black"] - record["white"]
+        black, white = (1 << square(4, 5)) | (1 << square(5, 4)), (1 << square(4, 4)) | (1 << square(5, 5))
+        color = 0
+        for move in record["moves"][:max_plies]:
+            if move is not None:
+                index = square(move[0], move[1])
+                canon_black, canon_white, symmetry = canonical(black, white)
+                result = 1 if diff == 0 else 2 if (diff > 0) == (color == 0) else 0
+                moves = stats.setdefault((canon_black, canon_white, color), {})
+                # a position can map onto itself - moves that are the same up to those symmetries share an entry
+                image = min(PERMUTATIONS[other][index] for other in range(8)
+                            if transform(black, other) == canon_black and transform(white, other) == canon_white)
+                entry = moves.setdefault(image, [0, 0])
+                entry[0] += 1
+                entry[1] += result
+                own, opp = (white, black) if color else (black, white)
+                flips = flip_mask(own, opp, index)
+                own |= flips | (1 << index)
+                opp &= ~flips
+                black, white = (opp, own) if color else (own, opp)
+            color = 1 - color
+    return stats
+
+
+def write_book(path: str, stats: dict, min_games: int = 1) -> int:
+    """Write the best move of every position with at least min_games games to a book file.  The best move has
+        the highest average score, with more games breaking ties.
+    :param str path: the book file
+    :param dict stats: the statistics from collect
+    :param int min_games: the fewest games a move needs to be stored
+    :return int: the number of positions stored"""
+    entries = []
+    for (black, white, color), moves in stats.items():
+        games, score, index = max((entry[1] / entry[0], entry[0], entry[1], index)
+                                  for index, entry in moves.items())[1:]
+        if games >= min_games:
+            entries.append((black, white, color, index, games, score))
+    slots = 16
+    while slots < 2 * len(entries):
+        slots *= 2
+    mask = slots - 1
+    table = [None] * slots
+    for entry in entries:
+        slot = _slot(entry[0], entry[1], entry[2], mask)
+        while table[slot] is not None:
+            slot = (slot + 1) & mask
+        table[slot] = entry
+    with open(path, "wb") as file:
+        file.write(FILE_HEADER.pack(MAGIC, slots, len(entries)))
+        empty = SLOT.pack(0, 0, 0, 0, 0, 0)
+        for entry in table:
+            file.write(empty if entry is None else SLOT.pack(*entry))
+    return len(entries)
+
+
+def build_book(archive: str, path: str, max_plies: int = 20, min_games: int = 1) -> int:
+    """Build a book file from a game archive
+    :param str archive: the game archive (see records.py)
+    :param str path: the book file to write
+    :param int max_plies: the number of plies from the start of each game to collect
+    :param int min_games: the fewest games a move needs to be stored
+    :return int: the number of positions stored"""
+    return write_book(path, collect(read_games(archive), max_plies), min_games)
+
+
+class OpeningBook:
+    """Represents an opening book file, memory mapped for lookups.
+    :param str path: the book file
+    """
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, slots, self.entries = FILE_HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an opening book")
+        self._mask = slots - 1
+
+    def close(self) -> None:
+        """Close the book file
+        :return: None"""
+        self._data.close()
+        self._file.close()
+        return
+
+    def lookup(self, black: int, white: int, color: int):
+        """Return the best known move for a position and its statistics, or None if the position is not in the book
+        :param int black: the bitboard of black pieces
+        :param int white: the bitboard of white pieces
+        :param int color: the player to move (0 = black, 1 = white)
+        :return: ((x, y) move, games, score) or None"""
+        canon_black, canon_white, symmetry = canonical(black, white)
+        slot = _slot(canon_black, canon_white, color, self._mask)
+        while True:
+            entry = SLOT.unpack_from(self._data, FILE_HEADER.size + slot * SLOT.size)
+            if entry[0] == 0 and entry[1] == 0:
+                return None
+            if entry[0] == canon_black and entry[1] == canon_white and entry[2] == color:
+                return coord(INVERSES[symmetry][entry[3]]), entry[4], entry[5]
+            slot = (slot + 1) & self._mask
+
+
+class BookPolicy:
+    """Move policy (see selfplay.py) that plays the book move when the position is in the book, and asks the
+        fallback policy otherwise.  The book is opened on first use, so the policy can be sent to worker processes.
+    :param str path: the book file
+    :param fallback: the policy for positions outside the book - by default a SearchPolicy
+    """
+    def __init__(self, path: str, fallback=None):
+        self._path = path
+        self._fallback = SearchPolicy() if fallback is None else fallback
+        self._book = None
+
+    def __call__(self, game, color: str, moves: list) -> tuple:
+        """Return the book move or the fallback policy's move
+        :param Othello game: the game being played
+        :param str color: the color of the player to move
+        :param list moves: the valid moves for the player
+        :return tuple: the chosen move"""
+        if game.get_size() != 8:
+            raise ValueError(f"Opening books hold 8x8 positions only, not {game.get_size()}x{game.get_size()}")
+        if self._book is None:
+            self._book = OpeningBook(self._path)
+        black, white = game.get_bitboards()
+        found = self._book.lookup(black, white, int(color.lower() != "black"))
+        if found is not None and found[0] in moves:
+            return found[0]
+        return self._fallback(game, color, moves)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_book"] = None                       # memory maps can't be pickled - reopened in the worker
+        return state
@@ -0,0 +1,145 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Client and load harness for the Othello game server (server.py).  The harness plays many random
+#               games at once over a few connections and reports the request latency and throughput.
+
+"""Run "python client.py --games 10000" to start a server in this process and play 10000 concurrent games against
+it, or pass --port or --unix to load a server that is already running.  Every game creates its players, then asks
+for the valid moves and plays a random one (or passes) until the server answers OVER."""
+
+import argparse
+import asyncio
+import random
+import time
+
+from server import GameServer, SessionManager
+
+
+class Client:
+    """Represents one connection to a game server.  Requests from several coroutines can share a connection -
+        each request waits for its own response before the next one is sent.
+    """
+    def __init__(self):
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+        self.latencies = []
+
+    async def connect(self, host: str = "127.0.0.1", port: int = 7878, path: str = None) -> None:
+        """Connect to a server - on a Unix socket if path is given, otherwise on TCP
+        :return: None"""
+        if path is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(path)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(host, port)
+        return
+
+    async def request(self, line: str) -> str:
+        """Send one request line and return the response line
+        :param str line: the request
+        :return str: the response, without the line ending"""
+        async with self._lock:
+            start = time.perf_counter()
+            self._writer.write(line.encode() + b"\n")
+            response = await self._reader.readline()
+            self.latencies.append(time.perf_counter() - start)
+        if not response:
+            raise ConnectionError("The server closed the connection")
+        return response.decode().rstrip("\n")
+
+    async def close(self) -> None:
+        """Send QUIT and close the connection
+        :return: None"""
+        await self.request("QUIT")
+        self._writer.close()
+        await self._writer.wait_closed()
+        return
+
+
+async def play_random(client: Client, rng: random.Random, engine: str = "bitboard") -> str:
+    """Play one game of random moves for both players on a server
+    :param Client client: the connection to play over
+    :param random.Random rng: chooses the moves
+    :param str engine: the Othello engine for the game
+    :return str: the OVER response that ended the game"""
+    game_id = (await client.request(f"NEW {engine}")).split()[1]
+    await client.request(f"PLAYER {game_id} Black black")
+    await client.request(f"PLAYER {game_id} White white")
+    color = "black"
+    while True:
+        moves = (await client.request(f"MOVES {game_id} {color}")).split()[1:]
+        if moves:
+            response = await client.request(f"MOVE {game_id} {color} {rng.choice(moves).replace(',', ' ')}")
+        else:
+            response = await client.request(f"PASS {game_id} {color}")
+        if response.startswith("OVER"):
+            await client.request(f"CLOSE {game_id}")
+            return response
+        if not response.startswith("OK"):
+            raise RuntimeError(f"Unexpected response {response!r}")
+        color = "white" if color == "black" else "black"
+
+
+async def run_harness(games: int = 1000, connections: int = 10, host: str = "127.0.0.1", port: int = None,
+                      path: str = None, engine: str = "bitboard", seed: int = 2023) -> dict:
+    """Play random games at once against a server and measure the request latency
+    :param int games: the number of games played concurrently
+    :param int connections: the number of connections the games are spread over
+    :param str host: the TCP host of the server
+    :param int port: the TCP port of the server - if neither port nor path is given, a server is started in this
+        process for the run
+    :param str path: the Unix socket path of the server
+    :param str engine: the Othello engine for the games
+    :param int seed: the random seed for the moves
+    :return dict: the number of "games" and "requests", the wall-clock "seconds", "requests_per_sec", the
+        "p50_ms" and "p99_ms" request latency and the server's "peak_games" when it runs in this process"""
+    server = None
+    if port is None and path is None:
+        server = GameServer(SessionManager(max_sessions=games))
+        host, port = (await server.start(host, 0))[:2]
+    clients = [Client() for _ in range(connections)]
+    for client in clients:
+        await client.connect(host, port, path)
+    peak = 0
+
+    async def watch():
+        nonlocal peak
+        while True:
+            peak = max(peak, len(server.manager))
+            await asyncio.sleep(0.01)
+
+    watcher = asyncio.ensure_future(watch()) if server is not None else None
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    await asyncio.gather(*(play_random(clients[number % connections], random.Random(rng.random()), engine)
+                           for number in range(games)))
+    seconds = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    if server is not None:
+        watcher.cancel()
+        await server.close()
+    latencies = sorted(latency for client in clients for latency in client.latencies)
+    return {"games": games, "requests": len(latencies), "seconds": seconds,
+            "requests_per_sec": len(latencies) / seconds, "p50_ms": latencies[len(latencies) // 2] * 1e3,
+            "p99_ms": latencies[int(len(latencies) * 0.99)] * 1e3, "peak_games": peak if server else None}
+
+
+def main():
+    """Run the harness from the command line and print its results"""
+    parser = argparse.ArgumentParser(description="Play concurrent random games against an Othello server.")
+    parser.add_argument("--games", type=int, default=1000, help="number of concurrent games")
+    parser.add_argument("--connections", type=int, default=10)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="server port (default: start a server here)")
+    parser.add_argument("--unix", default=None, help="server Unix socket path")
+    parser.add_argument("--engine", default="bitboard", choices=["tiles", "bitboard"])
+    args = parser.parse_args()
+    results = asyncio.run(run_harness(args.games, args.connections, args.host, args.port, args.unix, args.engine))
+    for name, value in results.items():
+        print(f"{name:<18} {value:,.3f}" if isinstance(value, float) else f"{name:<18} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Exact endgame solver for the Othello class.  With few blank squares left the rest of the game tree
+#               is searched to the end, giving the final disc difference under perfect play and the move that
+#               reaches it.
+
+"""The solver plays by the same rules as Othello.auto: a player with no valid move passes, the game is over when
+both players pass in a row or when 62 pieces have been played, and the score is the difference of the counts from
+return_winner_count (blank squares are not awarded to anyone).  Scores are from the point of view of the player to
+move.  Moves are ordered by parity (squares in quadrants with an odd number of blanks first) and, far enough from
+the end, fastest-first (the moves that leave the opponent the fewest replies first), and positions with enough
+blanks left are stored in a small transposition table of exact bounds."""
+
+from bitboard import GAME_OVER_PIECES, coord, flip_mask, legal_moves
+
+QUADRANTS = (0x000000000F0F0F0F, 0x00000000F0F0F0F0, 0x0F0F0F0F00000000, 0xF0F0F0F000000000)
+CORNERS = 0x8100000000000081
+X_SQUARES = 0x4200000000004200                 # the squares diagonally next to the corners
+
+FASTEST_FIRST_EMPTIES = 8                       # order by opponent replies with at least this many blanks
+TABLE_EMPTIES = 8                               # use the transposition table with at least this many blanks
+
+
+class EndgameSolver:
+    """Represents an exact endgame solver with its transposition table.
+    :param int table_bits: the transposition table has 2 ** table_bits slots
+    :ivar int nodes: the number of positions visited by the last call to solve
+    """
+    def __init__(self, table_bits: int = 16):
+        self._mask = (1 << table_bits) - 1
+        self._table = [None] * (1 << table_bits)
+        self.nodes = 0
+
+    def solve(self, black: int, white: int, color: int) -> tuple:
+        """Solve a position exactly
+        :param int black: the bitboard of black pieces
+        :param int white: the bitboard of white pieces
+        :param int color: the player to move (0 = black, 1 = white)
+        :return tuple: the final disc difference for the player to move under perfect play, and the best (x, y)
+            move or None if the player to move has no valid move"""
+        own, opp = (white, black) if color else (black, white)
+        self.nodes = 0
+        moves = legal_moves(own, opp)
+        if not moves or (own | opp).bit_count() >= GAME_OVER_PIECES:
+            return self._solve(own, opp, -64, 64, False), None
+        best, best_score = None, -65
+        alpha, beta = -64, 64
+        for index, flips in self._order(own, opp, moves, 64 - (own | opp).bit_count()):
+            new_own, new_opp = opp & ~flips, own | flips | (1 << index)
+            if best is None:
+                score = -self._solve(new_own, new_opp, -beta, -alpha, False)
+            else:                                   # prove the move is worse with a null window first
+                score = -self._solve(new_own, new_opp, -alpha - 1, -alpha, False)
+                if alpha < score < beta:
+                    score = -self._solve(new_own, new_opp, -beta, -score, False)
+            if score > best_score:
+                best, best_score = index, score
+                alpha = max(alpha, score)
+        return best_score, coord(best)
+
+    def _solve(self, own: int, opp: int, alpha: int, beta: int, passed: bool) -> int:
+        """Return the exact score of a position if it is inside (alpha, beta), or a bound outside it
+        :param int own: the bitboard of the player to move
+        :param int opp: the bitboard of the opponent
+        :param int alpha: the score the player to move is already guaranteed
+        :param int beta: the score the opponent is already guaranteed
+        :param bool passed: True if the previous player had no valid move
+        :return int: the score for the player to move"""
+        self.nodes += 1
+        pieces = (own | opp).bit_count()
+        if pieces >= GAME_OVER_PIECES:
+            return own.bit_count() - opp.bit_count()
+        moves = legal_moves(own, opp)
+        if not moves:
+            if passed:
+                return own.bit_count() - opp.bit_count()
+            return -self._solve(opp, own, -beta, -alpha, True)
+        if pieces == GAME_OVER_PIECES - 1:          # every move ends the game - score them without recursing
+            diff = own.bit_count() - opp.bit_count() + 1
+            best = -65
+            while moves:
+                low = moves & -moves
+                moves ^= low
+                score = diff + 2 * flip_mask(own, opp, low.bit_length() - 1).bit_count()
+                if score > best:
+                    best = score
+            return best
+        empties = 64 - pieces
+        slot = -1
+        tt_move = -1
+        if empties >= TABLE_EMPTIES:
+            slot = hash((own, opp)) & self._mask
+            entry = self._table[slot]
+            if entry is not None and entry[0] == own and entry[1] == opp:
+                lower, upper, tt_move = entry[2], entry[3], entry[4]
+                if lower >= beta:
+                    return lower
+                if upper <= alpha:
+                    return upper
+                if lower == upper:
+                    return lower
+                alpha = max(alpha, lower)
+                beta = min(beta, upper)
+        alpha_start, beta_start = alpha, beta
+        best, best_score = -1, -65
+        first = True
+        for index, flips in self._order(own, opp, moves, empties, tt_move):
+            new_own, new_opp = opp & ~flips, own | flips | (1 << index)
+            if first:
+                score = -self._solve(new_own, new_opp, -beta, -alpha, False)
+                first = False
+            else:
+                score = -self._solve(new_own, new_opp, -alpha - 1, -alpha, False)
+                if alpha < score < beta:
+                    score = -self._solve(new_own, new_opp, -beta, -score, False)
+            if score > best_score:
+                best, best_score = index, score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        if slot >= 0:
+            lower, upper = -64, 64
+            entry = self._table[slot]
+            if entry is not None and entry[0] == own and entry[1] == opp:
+                lower, upper = entry[2], entry[3]
+            if best_score <= alpha_start:
+                upper = min(upper, best_score)
+            elif best_score >= beta_start:
+                lower = max(lower, best_score)
+            else:
+                lower = upper = best_score
+            self._table[slot] = (own, opp, lower, upper, best)
+        return best_score
+
+    @staticmethod
+    def _order(own: int, opp: int, moves: int, empties: int, first: int = -1) -> list:
+        """Return the moves in search order: the table move, then fastest-first (far from the end), then moves in
+            quadrants with an odd number of blanks, corners and finally the X squares
+        :return list: (bit index, flipped pieces) pairs in search order"""
+        blanks = ~(own | opp)
+        odd = 0
+        for quadrant in QUADRANTS:
+            if (blanks & quadrant).bit_count() & 1:
+                odd |= quadrant
+        ordered = []
+        while moves:
+            low = moves & -moves
+            moves ^= low
+            index = low.bit_length() - 1
+            flips = flip_mask(own, opp, index)
+            if index == first:
+                priority = -100
+            else:
+                priority = 0 if low & odd else 2
+                if low & CORNERS:
+                    priority -= 1
+                elif low & X_SQUARES:
+                    priority += 1
+                if empties >= FASTEST_FIRST_EMPTIES:
+                    priority += 4 * legal_moves(opp & ~flips, own | flips | low).bit_count()
+            ordered.append((priority, index, flips))
+        ordered.sort()
+        return [(index, flips) for priority, index, flips in ordered]
+
+
+def solve(game, color: str) -> tuple:
+    """Solve an Othello game exactly for the player to move
+    :param Othello game: the game - on the 8x8 board
+    :param str color: the color of the player to move
+    :return tuple: the final disc difference for the player under perfect play and the best (x, y) move, or None
+        if the player has no valid move"""
+    if game.get_size() != 8:
+        raise ValueError(f"The endgame solver plays 8x8 boards only, not {game.get_size()}x{game.get_size()}")
+    black, white = game.get_bitboards()
+    return EndgameSolver().solve(black, white, int(color.lower() != "black"))
@@ -0,0 +1,230 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Table-driven position evaluator for the Othello class.  Edge and corner patterns are read off the
+#               bitboards as base-3 indexes into precomputed score tables and combined with mobility and frontier
+#               counts from the move generator.  Tables can be saved to and loaded from a compact file, and whole
+#               arrays of positions can be scored in one call.
+
+"""A pattern is a list of squares in one orientation (listed as bit indexes, see bitboard.py).  It is scored in all
+four rotations of the board with one shared table, so the top edge and the right edge read the same table.  The
+base-3 index of a pattern is the sum of 3 ** k * digit over its k-th square, where the digit is 0 for a blank
+square, 1 for a piece of the player to move and 2 for an opposing piece.  Indexes are built eight squares at a
+time from the bytes of the bitboards with per-row lookup tables, so scoring a pattern is a few list lookups.
+
+The score of a position for the player to move is the sum of its pattern scores, plus mobility times the
+difference in valid moves, minus frontier times the difference in frontier pieces (pieces next to a blank
+square), clamped below search.SCORE_DISC so that a won game always scores higher.  An evaluator can be passed to
+Search or SearchPolicy as the evaluate function.
+
+Table file layout: MAGIC, the number of patterns, the mobility and frontier weights, then for each pattern its
+name length, name (UTF-8), number of squares, squares (one byte each) and 3 ** squares little-endian int16 scores.
+
+evaluate_batch scores arrays of positions with NumPy (see batch.py) and needs numpy; everything else runs on
+plain Python integers."""
+
+import array
+import struct
+import sys
+
+from bitboard import legal_moves, neighbours
+from search import SCORE_DISC, WEIGHTS
+
+MAGIC = b"OEV1"
+FILE_HEADER = struct.Struct("<4sHhh")
+
+EDGE = [0, 1, 2, 3, 4, 5, 6, 7, 9, 14]             # the top edge and the two X squares below it
+CORNER = [0, 1, 2, 8, 9, 10, 16, 17, 18]           # the 3x3 block in the top left corner
+
+
+def rotate(index: int) -> int:
+    """Return the square a square moves to when the board is turned a quarter turn clockwise
+    :param int index: the bit index of the square
+    :return int: the bit index after the turn"""
+    row, column = divmod(index, 8)
+    return column * 8 + (7 - row)
+
+
+def rotations(squares: list) -> list:
+    """Return a pattern in all four rotations of the board
+    :param list squares: the bit indexes of the pattern's squares
+    :return list: four lists of bit indexes"""
+    output = [list(squares)]
+    for _ in range(3):
+        output.append([rotate(index) for index in output[-1]])
+    return output
+
+
+def row_tables(squares: list) -> list:
+    """Return the per-row lookup tables that build the base-3 index of one orientation of a pattern from the bytes
+        of a bitboard
+    :param list squares: the bit indexes of the pattern's squares
+    :return list: (row, table) pairs, where table[byte] is the summed 3 ** k of the pattern squares set in the
+        byte"""
+    output = []
+    for row in sorted({index // 8 for index in squares}):
+        table = []
+        for value in range(256):
+            table.append(sum(3 ** k for k, index in enumerate(squares)
+                             if index // 8 == row and value >> (index % 8) & 1))
+        output.append((row, table))
+    return output
+
+
+def _digits(squares: list, index: int) -> list:
+    """Return the base-3 digits of a pattern index, one per square"""
+    output = []
+    for _ in squares:
+        index, digit = divmod(index, 3)
+        output.append(digit)
+    return output
+
+
+def default_corner(squares: list) -> array.array:
+    """Build the default corner table: square weights from search.WEIGHTS, except that the squares next to the
+        corner only count against their owner while the corner is blank
+    :param list squares: the corner pattern, corner first
+    :return array.array: the int16 table"""
+    table = array.array("h")
+    for index in range(3 ** len(squares)):
+        digits = _digits(squares, index)
+        score = 0
+        for square, digit in zip(squares, digits):
+            if digit:
+                weight = WEIGHTS[square]
+                if digits[0] and weight < -10:      # the corner is taken - its neighbours are no longer a risk
+                    weight = 5
+                score += weight if digit == 1 else -weight
+        table.append(score)
+    return table
+
+
+def default_edge(squares: list) -> array.array:
+    """Build the default edge table: the weights of the edge squares outside the corner blocks, plus a bonus for
+        every piece in an unbroken line running from a corner along the edge (those pieces can't be flipped)
+    :param list squares: the edge pattern, the eight edge squares in order first
+    :return array.array: the int16 table"""
+    table = array.array("h")
+    for index in range(3 ** len(squares)):
+        digits = _digits(squares, index)
+        score = sum((WEIGHTS[square] if digit == 1 else -WEIGHTS[square])
+                    for square, digit in zip(squares[3:5], digits[3:5]) if digit)
+        for line in (digits[:8], digits[7::-1]):
+            if line[0]:
+                run = 0
+                while run < 8 and line[run] == line[0]:
+                    run += 1
+                score += 10 * run if line[0] == 1 else -10 * run
+        table.append(score)
+    return table
+
+
+class PatternEvaluator:
+    """Represents a table-driven evaluator.  Call it as evaluate(own, opp) like search.evaluate.
+    :param list patterns: (name, squares, table) triples, where table holds 3 ** len(squares) int16 scores - by
+        default an edge and a corner pattern with tables built from search.WEIGHTS
+    :param int mobility: the score of each valid move more than the opponent
+    :param int frontier: the score of each frontier piece fewer than the opponent
+    """
+    def __init__(self, patterns: list = None, mobility: int = 10, frontier: int = 5):
+        if patterns is None:
+            patterns = [("edge", EDGE, default_edge(EDGE)), ("corner", CORNER, default_corner(CORNER))]
+        for name, squares, table in patterns:
+            if len(table) != 3 ** len(squares):
+                raise ValueError(f"The {name} table needs {3 ** len(squares)} scores, not {len(table)}")
+        self.patterns = [(name, list(squares), array.array("h", table)) for name, squares, table in patterns]
+        self.mobility = mobility
+        self.frontier = frontier
+        # one (table, row tables) entry per pattern orientation
+        self._lookups = [(table, row_tables(oriented)) for name, squares, table in self.patterns
+                         for oriented in rotations(squares)]
+        self._batch = None
+
+    def __call__(self, own: int, opp: int) -> int:
+        """Return the score of a position for the player to move
+        :param int own: the bitboard of the player to move
+        :param int opp: the bitboard of the opponent
+        :return int: the score"""
+        score = 0
+        for table, rows in self._lookups:
+            index = 0
+            for row, values in rows:
+                index += values[own >> (row * 8) & 255] + 2 * values[opp >> (row * 8) & 255]
+            score += table[index]
+        score += self.mobility * (legal_moves(own, opp).bit_count() - legal_moves(opp, own).bit_count())
+        edge = neighbours(~(own | opp) & 0xFFFFFFFFFFFFFFFF)
+        score -= self.frontier * ((own & edge).bit_count() - (opp & edge).bit_count())
+        return max(-SCORE_DISC + 1, min(SCORE_DISC - 1, score))
+
+    def evaluate_batch(self, black, white, colors):
+        """Return the score of every position in arrays of positions for its player to move (see batch.py)
+        :param black: the uint64 array of black pieces
+        :param white: the uint64 array of white pieces
+        :param colors: the player to move - 0 = black, 1 = white - as a scalar or one entry per board
+        :return: the int64 array of scores"""
+        import numpy as np
+
+        import batch
+        if self._batch is None:
+            self._batch = [(np.asarray(table, dtype=np.int64),
+                            [(np.uint64(row * 8), np.asarray(values, dtype=np.int64)) for row, values in rows])
+                           for table, rows in self._lookups]
+        black = np.asarray(black, dtype=np.uint64)
+        white = np.asarray(white, dtype=np.uint64)
+        own, opp = batch.split(black, white, np.broadcast_to(colors, black.shape))
+        byte = np.uint64(255)
+        score = np.zeros(own.shape, dtype=np.int64)
+        for table, rows in self._batch:
+            index = np.zeros(own.shape, dtype=np.int64)
+            for offset, values in rows:
+                index += values[((own >> offset) & byte).astype(np.intp)]
+                index += 2 * values[((opp >> offset) & byte).astype(np.intp)]
+            score += table[index]
+        score += self.mobility * (batch.popcount(batch.legal_moves(own, opp)).astype(np.int64) -
+                                  batch.popcount(batch.legal_moves(opp, own)).astype(np.int64))
+        edge = batch.neighbours(~(own | opp))
+        score -= self.frontier * (batch.popcount(own & edge).astype(np.int64) -
+                                  batch.popcount(opp & edge).astype(np.int64))
+        return np.clip(score, -SCORE_DISC + 1, SCORE_DISC - 1)
+
+    def save(self, path: str) -> None:
+        """Write the weights and tables to a table file
+        :param str path: the file
+        :return: None"""
+        with open(path, "wb") as file:
+            file.write(FILE_HEADER.pack(MAGIC, len(self.patterns), self.mobility, self.frontier))
+            for name, squares, table in self.patterns:
+                name = name.encode()
+                file.write(bytes([len(name)]) + name + bytes([len(squares)]) + bytes(squares))
+                values = array.array("h", table)
+                if sys.byteorder == "big":
+                    values.byteswap()
+                file.write(values.tobytes())
+        return
+
+    @classmethod
+    def load(cls, path: str):
+        """Read an evaluator from a table file
+        :param str path: the file
+        :return PatternEvaluator: the evaluator"""
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, count, mobility, frontier = FILE_HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an evaluator table file")
+        position = FILE_HEADER.size
+        patterns = []
+        for _ in range(count):
+            length = data[position]
+            name = data[position + 1:position + 1 + length].decode()
+            position += 1 + length
+            size = data[position]
+            squares = list(data[position + 1:position + 1 + size])
+            position += 1 + size
+            values = array.array("h")
+            values.frombytes(data[position:position + 2 * 3 ** size])
+            if sys.byteorder == "big":
+                values.byteswap()
+            position += 2 * 3 ** size
+            patterns.append((name, squares, values))
+        return cls(patterns, mobility, frontier)
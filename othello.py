@@ -8,10 +8,53 @@
 """NOTE: THE DESIGN OF THIS PROGRAM COULD BE GREATLY OPTIMIZED, BUT WAS DESIGNED TO PRODUCE CERTAIN OUTPUTS FROM
 CERTAIN METHODS FOR TESTING/GRADING PURPOSES FOR CLASS"""
 
+import struct
+import sys
+
+from bitboard import BitboardEngine, geometry
+from profiler import Profiler
+from search import SearchPolicy
+
+SIZES = (4, 6, 8, 10, 12, 14, 16)    # the supported board sizes - even, so the four starting pieces are centred
+_TILE_LAYOUTS = {}
+# translate tables from Tile values to the binary digits of the black and white bitboards
+BLACK_DIGITS = bytes.maketrans(b"\x00\x01\x02", b"100")
+WHITE_DIGITS = bytes.maketrans(b"\x00\x01\x02", b"010")
+
+# snapshot layout: version, engine, turn, piece_counter, no_moves, over, auto, black and white bitboards, number of
+# moves in the history - then one byte per history move (square | 64 for white) and one entry per player
+SNAPSHOT = struct.Struct("<7BQQH")
+SNAPSHOT_VERSION = 1
+# boards other than 8x8: version, engine, turn, piece_counter (uint16 - a 16x16 board holds 256 pieces), no_moves,
+# over, auto, size, number of moves in the history - then the black and white bitboards in (size * size + 7) // 8
+# bytes each, one little-endian uint16 per history move (square | 0x8000 for white) and one entry per player
+SNAPSHOT_SIZED = struct.Struct("<3BH4BH")
+SNAPSHOT_SIZED_VERSION = 2
+ENGINES = ("tiles", "bitboard")
+
+
+def tile_layout(size: int) -> tuple:
+    """Return the Tile array layout of a board size, building it on first use.  The array is indexed by
+        x * (size + 2) + y - the playing area with a border all the way around it.
+    :param int size: the number of rows and columns
+    :return tuple: the Tile values of the empty board (3 = border, printed " * ", 2 = blank, printed " . "), the
+        Tile index of each bitboard square (see bitboard.py) and the index offsets of the eight directions in
+        make_move order"""
+    layout = _TILE_LAYOUTS.get(size)
+    if layout is None:
+        width = size + 2
+        empty = bytes(3 if x in (0, width - 1) or y in (0, width - 1) else 2 for x in range(width)
+                      for y in range(width))
+        tile_index = [(index // size + 1) * width + index % size + 1 for index in range(size * size)]
+        offsets = (width, width + 1, 1, -width + 1, -1, -width - 1, -width, width - 1)
+        layout = _TILE_LAYOUTS[size] = (empty, tile_index, offsets)
+    return layout
+
+
 def main():
-    """Main function for running game"""
+    """Main function for running game.  Pass black or white on the command line to play against the computer."""
     game = Othello()
-    game.auto()
+    game.auto(computer=sys.argv[1].lower() if len(sys.argv) > 1 else None)
 
 
 class Player:
@@ -21,6 +64,8 @@ class Player:
     :param str name: the name of the player
     :param str color: the color of the player (either 'white' or 'black')
     """
+    __slots__ = ("_name", "_color")
+
     def __init__(self, name: str, color: str):
         self._name = name
         self._color = color
@@ -32,142 +77,121 @@ class Player:
 
 
 class Othello:
-    """Represents the board game Othello.  Contains two inner classes: Tile - which represents a single Tile
-        on the board, and Piece - which represents Pieces played onto Tiles.  Othello class contains the data and
-        methods to run the game, Tile objects hold the state of the current board, Piece objects hold the state of
-        each piece played on Tile objects.  Player objects are used by the Othello class to display
-        the name and color of the winner of the game.
+    """Represents the board game Othello.  Othello class contains the data and methods to run the game.  The board
+        is stored as a flat bytearray of Tile values indexed by x * 10 + y (a 10x10 grid with a border all the way
+        around the 8x8 playing area), so a game holds no per-square objects and no reference cycles.  Player
+        objects are used by the Othello class to display the name and color of the winner of the game.  Passing
+        engine="bitboard" replaces the Tile array with a BitboardEngine (see bitboard.py) that stores the board as
+        two 64-bit integers and returns identical results from the board methods.  snapshot and restore save and
+        rebuild the whole game state as a small bytes blob.
+        Other board sizes (see SIZES) index the Tiles by x * (size + 2) + y and use size * size bit bitboards; the
+        game is over when all but two squares have been played (62 pieces on 8x8).
+    :param str engine: the board engine to use - "tiles" (default) or "bitboard"
+    :param int size: the number of rows and columns of the board (default 8)
     :ivar dict game: stores the data needed to run the game
-    :ivar list board: stores the nested list of what symbol exists at each [x, y] coordinate in the game
+    :ivar list board: stores the nested list of what symbol exists at each [x, y] coordinate in the game, built
+        lazily by the board property
     """
 
-    def __init__(self):
+    def __init__(self, engine: str = "tiles", size: int = 8):
+        if engine not in ("tiles", "bitboard"):
+            raise ValueError(f'Unknown engine "{engine}".  The engine must be "tiles" or "bitboard"')
+        self._set_size(size)
         self._game = {'turn': 0, "piece_counter": 0, "player_counter": 0, "over": 0, "auto": 0,
-                      "no_moves": 0, "tiles": {}, "pieces": {}, "players": []}
-        self._board = []            # board to store nested list of current board
+                      "no_moves": 0, "tiles": None, "players": [], "engine": None, "move_cache": None,
+                      "history": []}
+        self._engine_name = engine
+        self._board = None          # board to store nested list of current board, None until read (see board)
+        self._profiler = None       # the Profiler collecting counters for this game, if any (see enable_profiling)
         self.initialize_game()      # run the initializer to create game
 
-    class Piece:
-        """Represents a playing piece that is played on Tile objects.  There are 62 Piece objects that can
-            be possibly played.  Once set on a Tile, a piece cannot be moved, and once all Pieces have been
-            played, the game is over.  Piece objects are stored in self._game["pieces"] as piece_id: color pairs.
-            Piece objects are 'played' onto Tile objects to track the current state of the board.  Piece is an inner
-            class of Othello.
-        :param int number: the id number of the piece
-        :param int color: the color of the piece (0 = black, 1 = white)
-        :param Othello outer: the self object from the outer class (Othello) for calling methods from the outer class
-        """
-        def __init__(self, number: int, color: int, outer):
-            self._piece_id = number
-            self._color = color
-            self._outer = outer
-
-        def get_color(self) -> int:
-            """Return the color of self
-            :return color of self"""
-            return self._color
-
-        def change_color(self) -> None:
-            """Flip the color of the Piece object
-            :return None"""
-            self._color = int(not self._color)
-            return
-
-    class Tile:
-        """Represents an individual tile on a playing board with an x, y coordinate pair.  Tile objects either store
-            an integer that represents the value to print or a Piece object (that will be either white or black).
-            Integers were chosen as values over symbols for a more extensible design.  Adding/changing symbols can be
-            done in the symbol lists in the print_board AND board_to_list methods.  Tile objects are stored in
-            self._game["tiles"] as xy: item pairs.  Tile is an inner class of Othello.
-        :param int x: the x coordinate of the tile
-        :param int y: the y coordinate of the tile
-        :param item: the value to be stored at the x,y coordinate pair
-        :param Othello outer: the self object from the outer class (Othello) for calling methods from the outer class
-        """
-        def __init__(self, x: int, y: int, item: int, outer):
-            self._coord = x * 10 + y
-            self._item = item
-            self._outer = outer
-
-        def get_tile(self) -> int:
-            """Return the item value of self or the color of the Piece object played on the Tile
-            :return integer value of the current state of the Tile - 0 = black, 1 = white, 2 = border, 3 = blank"""
-            if type(self._item) == int:
-                return self._item
-            elif type(self._item) == Othello.Piece:
-                piece = self._item
-                return piece.get_color()
-
-        def flip_piece(self) -> None:
-            """Flips the color of a Piece object on a Tile
-            :return None"""
-            if type(self._item) == int:
-                return
-            elif type(self._item) == Othello.Piece:
-                self._item.change_color()
-                return
-
-        def set_piece(self, color) -> None:
-            """Pulls a Piece from the stock, sets the color and places the Piece object on a Tile
-            :param color: the color of the piece to place
-            :return None"""
-            piece = self._outer.get_piece()
-            if color == "white":            # pieces are initialized as black, so flip if white piece is played
-                piece.change_color()
-            self._item = piece
-            return
+    def _set_size(self, size: int) -> None:
+        """Set the board size and the Tile layout used by the board methods
+        :param int size: the number of rows and columns
+        :return: None"""
+        if size not in SIZES:
+            raise ValueError(f"Unknown board size {size}.  The size must be one of {', '.join(map(str, SIZES))}")
+        self._size = size
+        self._width = size + 2                          # the Tile index of (x, y) is x * self._width + y
+        self._offsets = tile_layout(size)[2]
+        self._geometry = geometry(size)
+        return
 
     def initialize_game(self) -> None:
-        """Initializes the Tiles, Pieces, starting positions, and self._board before the start of each game.
-            --- Create Tile objects for each x, y coordinate in the game, set initial value, and store objects.
-            --- Create 62 Piece objects for the game, set initial value to black, and store objects.
-            --- Place the four starting pieces on the board
-            --- Generate the current board state out of Tile/Piece objects and store as a nested list matrix in
-                 self._board.
+        """Initializes the Tiles, starting positions, and self._board before the start of each game.
+            --- Copy the empty board - Tile values for each x, y coordinate: 3 = border, 2 = blank.
+            --- Place the four starting pieces on the board and count them as played
+            --- Mark self._board as out of date - the board property builds the nested list matrix out of the
+                 Tiles the first time it is read.
+            --- With the bitboard engine, the BitboardEngine replaces the Tiles.
             :return: None
         """
-        # init Tiles
-        for x in range(10):
-            for y in range(10):
-                name = x * 10 + y
-                if x == 0 or x == 9 or y == 0 or y == 9:
-                    item = 3   # will print " * "
-                else:
-                    item = 2   # will print " . "
-                self._game["tiles"][name] = Othello.Tile(x, y, item, self)
+        self._game["move_cache"] = None
+        self._game["history"] = []
+        self._game["piece_counter"] = 4
+        self._board = None
+        if self._engine_name == "bitboard":
+            self._game["engine"] = BitboardEngine(self._size)
+            return
 
-        # init Pieces
-        for item in range(64):
-            self._game["pieces"][item] = Othello.Piece(item, 0, self)
+        # init Tiles
+        self._game["tiles"] = bytearray(tile_layout(self._size)[0])
 
         # init starting positions  NOTE: COORDINATES ARE BASED ON X,Y STARTING FROM TOP LEFT CORNER
-        init_dict = {44: "white", 45: "black", 55: "white", 54: "black"}
+        # (44: 1, 45: 0, 55: 1, 54: 0 on 8x8)
+        middle = self._size // 2 * self._width + self._size // 2
+        init_dict = {middle: 1, middle + 1: 0, middle + self._width + 1: 1, middle + self._width: 0}
         for item in init_dict:
-            tile = self._game["tiles"][item]
-            color = init_dict[item]
-            tile.set_piece(color)
-
-        # init the board to the starting values for the game
-        self._board = self.board_to_list()
+            self._game["tiles"][item] = init_dict[item]
         return
 
-    def get_piece(self):
-        """Return the current piece counter and increment the counter:
-        :return: the next available piece object or None if out of pieces"""
-        counter = self._game["piece_counter"]
-        if counter >= 63:
-            return None
-        self._game["piece_counter"] += 1
-        return self._game["pieces"][counter]
+    def get_size(self) -> int:
+        """Return the number of rows and columns of the board
+        :return int: the board size"""
+        return self._size
+
+    def get_game_over_pieces(self) -> int:
+        """Return the number of pieces that ends the game - all but two squares of the board (62 on 8x8)
+        :return int: the piece count"""
+        return self._geometry.game_over_pieces
+
+    def get_piece_counter(self) -> int:
+        """Return the number of pieces played so far (including the four starting pieces).  The game is over when
+            62 pieces have been played (see get_game_over_pieces).
+        :return int: the piece counter"""
+        return self._game["piece_counter"]
+
+    def get_bitboards(self) -> tuple:
+        """Return the current board as two 64-bit integers (see bitboard.py) for either engine - size * size bit
+            integers on other board sizes
+        :return tuple: the black and white bitboards"""
+        if self._game["engine"] is not None:
+            return self._game["engine"].black, self._game["engine"].white
+        # the playable Tiles row by row, then one "0"/"1" digit per square, highest square first
+        tiles = self._game["tiles"]
+        width = self._width
+        inner = b"".join([tiles[x * width + 1:x * width + width - 1] for x in range(1, width - 1)])[::-1]
+        return int(inner.translate(BLACK_DIGITS), 2), int(inner.translate(WHITE_DIGITS), 2)
+
+    def get_tile(self, x: int, y: int) -> int:
+        """Return the integer value of the Tile at an x, y coordinate for either engine
+        :param int x: the x coordinate (0-9, including the border - 0 to size + 1 on other board sizes)
+        :param int y: the y coordinate (0-9, including the border - 0 to size + 1 on other board sizes)
+        :return int: 0 = black, 1 = white, 2 = blank, 3 = border"""
+        if self._game["engine"] is not None:
+            return self._game["engine"].get_tile(x, y)
+        return self._game["tiles"][x * self._width + y]
 
     def print_board(self) -> None:                              # REQUIRED
-        """Using the current state of the Tile and Piece objects, print board to the console
+        """Using the current state of the Tiles, print board to the console
         :return: None"""
+        if self._game["engine"] is not None:
+            return self._game["engine"].print_board()
         symbol = [" X ", " O ", " . ", " * "]
-        for item in self._game["tiles"]:
-            tile = self._game["tiles"][item].get_tile()
+        for item in range(len(self._game["tiles"])):
+            tile = self._game["tiles"][item]
             print(symbol[tile], end="")
-            if item % 10 == 9:
+            if item % self._width == self._width - 1:
                 print()
         return
 
@@ -195,12 +219,143 @@ class Othello:
         self._game["player_counter"] += 1
         return
 
+    def get_players(self) -> dict:
+        """Return the names of the players created with create_player
+        :return dict: color: name pairs"""
+        players = {}
+        for player in self._game["players"]:
+            player_name, player_color = player.get_player()
+            players[player_color] = player_name
+        return players
+
+    def enable_profiling(self, profiler: Profiler = None) -> Profiler:
+        """Start collecting counters and latency histograms for this game's hot paths (see profiler.py)
+        :param Profiler profiler: the Profiler to collect into - several games can share one - or None for a new one
+        :return Profiler: the Profiler"""
+        if self._profiler is not None:
+            self._profiler.detach(self)
+        profiler = Profiler() if profiler is None else profiler
+        profiler.attach(self)
+        return profiler
+
+    def disable_profiling(self) -> None:
+        """Stop collecting counters and histograms for this game
+        :return: None"""
+        if self._profiler is not None:
+            self._profiler.detach(self)
+        return
+
+    def get_profiler(self):
+        """Return the Profiler collecting counters for this game
+        :return: the Profiler, or None if profiling is off"""
+        return self._profiler
+
+    def snapshot(self) -> bytes:
+        """Save the whole game state - board, turn, piece counter, no_moves and over flags, history and players -
+            as a small bytes blob that restore (or from_snapshot) rebuilds the game from
+        :return bytes: the snapshot"""
+        black, white = self.get_bitboards()
+        game = self._game
+        square = self._geometry.square
+        if self._size == 8:
+            history = bytes(square(move[0], move[1]) | (64 if color == "white" else 0)
+                            for color, move in game["history"])
+            output = [SNAPSHOT.pack(SNAPSHOT_VERSION, ENGINES.index(self._engine_name), int(game["turn"]),
+                                    game["piece_counter"], game["no_moves"], game["over"], game["auto"], black,
+                                    white, len(history)), history, bytes([len(game["players"])])]
+        else:
+            length = (self._size * self._size + 7) // 8
+            history = b"".join((square(move[0], move[1]) | (0x8000 if color == "white" else 0)).to_bytes(2, "little")
+                               for color, move in game["history"])
+            output = [SNAPSHOT_SIZED.pack(SNAPSHOT_SIZED_VERSION, ENGINES.index(self._engine_name),
+                                          int(game["turn"]), game["piece_counter"], game["no_moves"], game["over"],
+                                          game["auto"], self._size, len(game["history"])),
+                      black.to_bytes(length, "little"), white.to_bytes(length, "little"), history,
+                      bytes([len(game["players"])])]
+        for player in game["players"]:
+            name, color = player.get_player()
+            name = name.encode()[:255].decode("utf-8", "ignore").encode()    # cut on a character boundary
+            output.append(bytes([color == "white", len(name)]) + name)
+        return b"".join(output)
+
+    def restore(self, data: bytes) -> None:
+        """Replace the whole game state with a snapshot from snapshot.  The engine of the snapshot is used, the
+            move cache is rebuilt on the next query, and a profiler stays attached.
+        :param bytes data: the snapshot
+        :return: None"""
+        if data[0] == SNAPSHOT_VERSION:
+            (version, engine, turn, piece_counter, no_moves, over, auto, black, white,
+             count) = SNAPSHOT.unpack_from(data)
+            size = 8
+            position = SNAPSHOT.size
+            history = [("white" if byte & 64 else "black", ((byte & 63) // 8 + 1, byte % 8 + 1))
+                       for byte in data[position:position + count]]
+            position += count
+        elif data[0] == SNAPSHOT_SIZED_VERSION:
+            (version, engine, turn, piece_counter, no_moves, over, auto, size,
+             count) = SNAPSHOT_SIZED.unpack_from(data)
+            length = (size * size + 7) // 8
+            position = SNAPSHOT_SIZED.size
+            black = int.from_bytes(data[position:position + length], "little")
+            white = int.from_bytes(data[position + length:position + 2 * length], "little")
+            position += 2 * length
+            history = []
+            for offset in range(position, position + 2 * count, 2):
+                value = data[offset] | data[offset + 1] << 8
+                history.append(("white" if value & 0x8000 else "black",
+                                ((value & 0x7FFF) // size + 1, (value & 0x7FFF) % size + 1)))
+            position += 2 * count
+        else:
+            raise ValueError(f"Unknown snapshot version {data[0]}")
+        players = []
+        for _ in range(data[position]):
+            length = data[position + 2]
+            players.append(Player(data[position + 3:position + 3 + length].decode("utf-8", "replace"),
+                                  "white" if data[position + 1] else "black"))
+            position += 2 + length
+        self._set_size(size)
+        self._engine_name = ENGINES[engine]
+        self._board = None
+        self._game = {"turn": turn, "piece_counter": piece_counter, "player_counter": len(players), "over": over,
+                      "auto": auto, "no_moves": no_moves, "tiles": None, "players": players, "engine": None,
+                      "move_cache": None, "history": history}
+        if engine:
+            self._game["engine"] = BitboardEngine(size)
+            self._game["engine"].black = black
+            self._game["engine"].white = white
+        else:
+            empty, tile_index, offsets = tile_layout(size)
+            tiles = self._game["tiles"] = bytearray(empty)
+            for value, bb in ((0, black), (1, white)):
+                while bb:
+                    low = bb & -bb
+                    tiles[tile_index[low.bit_length() - 1]] = value
+                    bb ^= low
+        return
+
+    @classmethod
+    def from_snapshot(cls, data: bytes):
+        """Build a new game from a snapshot, for example to clone a game or bring back a parked one
+        :param bytes data: the snapshot from snapshot
+        :return Othello: the game"""
+        game = cls.__new__(cls)
+        game._profiler = None
+        game.restore(data)
+        return game
+
+    def get_history(self) -> list:
+        """Return the moves played on the board so far, in order
+        :return list: (color, (x, y)) pairs"""
+        return list(self._game["history"])
+
     def return_winner_count(self) -> tuple:
         """Return the current number of black and white Pieces played on the board
         :return black_count, white_count"""
+        if self._game["engine"] is not None:
+            return self._game["engine"].return_winner_count()
         black_count, white_count = 0, 0
-        for item in self._game["tiles"]:
-            tile = self._game["tiles"][item].get_tile()
+        for item in range(len(self._game["tiles"])):
+            tile = self._game["tiles"][item]
             if tile == 1:
                 white_count += 1
             elif tile == 0:
@@ -213,10 +368,7 @@ class Othello:
         :return str: a string value for the winner of the game or None if there is an error
         """
         black_count, white_count = self.return_winner_count()
-        players = {}
-        for player in self._game["players"]:
-            player_name, player_color = player.get_player()
-            players[player_color] = player_name
+        players = self.get_players()
         if black_count > white_count:
             return 'Winner is black player: ' + str(players["black"])
         elif black_count == white_count:
@@ -226,35 +378,144 @@ class Othello:
 
     def return_available_positions(self, color: str) -> list:        # REQUIRED
         """Return a list of possible positions for the player with the given color to move on the current board.
-            --- Will first find all Pieces on the board of the parameter color.
-            --- For each Piece on the board, it will search in each direction for valid moves - left, left-up, up,
-                    right-up, right, right-down, down, left-down  (using helper function positions_helper)
-            --- Appends the possible moves to a list and returns a list of Tuple coordinates for valid moves
+            --- Valid moves for both colors are kept in a cache (see move_cache) that make_move only updates
+                    around the played and flipped Pieces, so the board is only scanned once per game
+            --- Repeated calls for the same position return the stored sorted list without searching again
+            --- Returns a list of Tuple coordinates for valid moves
         :param str color: the color of the current player
         :return list moves: a list of all valid moves for the parameter color
         """
-        move_list = []
+        if self._game["engine"] is not None:
+            return self._game["engine"].return_available_positions(color)
         if color.lower() == "black":
             color = 0
         else:
             color = 1
+        cache = self.move_cache()
+        if cache["sorted"][color] is None:
+            cache["sorted"][color] = sorted(divmod(coord, self._width) for coord in cache[color])
+        return list(cache["sorted"][color])
+
+    def scan_available_positions(self, color: int) -> list:
+        """Scan the whole board for the possible positions for the player with the given color.  Used to fill the
+            move cache at the start of a game.
+            --- Will first find all Pieces on the board of the parameter color.
+            --- For each Piece on the board, it will search in each direction for valid moves - left, left-up, up,
+                    right-up, right, right-down, down, left-down  (using helper function positions_helper)
+            --- Adds the possible moves to a set and returns a sorted list of Tuple coordinates for valid moves
+        :param int color: the integer value for the current players color (0=black, 1=white)
+        :return list moves: a list of all valid moves for the parameter color
+        """
+        move_set = set()
         # get a list of colored pieces on the board to iterate through
-        pieces = [item for item in self._game["tiles"] if self._game["tiles"][item].get_tile() == color]
+        pieces = [item for item, tile in enumerate(self._game["tiles"]) if tile == color]
         for coord in pieces:
-            x = coord % 100 // 10                     # break coordinate into constituents
-            y = coord % 10
+            x, y = divmod(coord, self._width)         # break coordinate into constituents
             directions = [[1, 0], [1, 1], [0, 1], [-1, 1], [0, -1], [-1, -1], [-1, 0], [1, -1]]
             for direction in directions:        # try moves in each direction
                 possible = self.positions_helper(x, y, direction, color)
-                if possible:                    # if a move is valid,
-                    if possible not in move_list:   # check if move is already in the list (no duplicates)
-                        move_list.append([possible[0], possible[1]])
-        if not move_list:
-            return []
+                if possible:                    # if a move is valid, add it (the set removes duplicates)
+                    move_set.add((possible[0], possible[1]))
+        return sorted(move_set)
+
+    def move_cache(self) -> dict:
+        """Return the move cache, building it from a full board scan if there is not a current one.  The cache
+            stores the Tile coordinates (x * 10 + y on 8x8) of the valid moves for each color as 0: set, 1: set, the
+            "frontier" set of blank Tiles next to at least one Piece (the only Tiles that can ever be valid moves),
+            and the "sorted" lists handed out by return_available_positions.
+        :return dict: the move cache stored in self._game["move_cache"]
+        """
+        cache = self._game["move_cache"]
+        if cache is None:
+            tiles = self._game["tiles"]
+            frontier = set()
+            for coord in range(len(tiles)):
+                if tiles[coord] == 2:
+                    for offset in self._offsets:
+                        if tiles[coord + offset] < 2:
+                            frontier.add(coord)
+                            break
+            cache = {"frontier": frontier, "sorted": {0: None, 1: None}}
+            for color in (0, 1):
+                cache[color] = {x * self._width + y for x, y in self.scan_available_positions(color)}
+            self._game["move_cache"] = cache
+        return cache
+
+    def update_move_cache(self, changed: list) -> None:
+        """Update the move cache after a move (or after unmake_move takes one back), only re-checking the blank
+            Tiles whose lines run through a changed Tile.  A blank Tile's moves only depend on the unbroken run of
+            Pieces next to it in each direction, so walking out from every changed Tile to the first blank Tile in
+            each direction finds every Tile that can have changed.
+        :param list changed: the Tile coordinates (x * 10 + y on 8x8) of the played Tile followed by the flipped
+            Tiles
+        :return: None
+        """
+        cache = self._game["move_cache"]
+        if cache is None:                                   # nothing cached yet - built on the next query
+            return
+        tiles = self._game["tiles"]
+        offsets = self._offsets
+        played = changed[0]
+        frontier = cache["frontier"]
+        # only the played Tile and its neighbours can join or leave the frontier
+        for coord in (played,) + tuple(played + offset for offset in offsets):
+            if tiles[coord] == 2 and any(tiles[coord + offset] < 2 for offset in offsets):
+                frontier.add(coord)
+            else:
+                frontier.discard(coord)
+        affected = set()
+        if tiles[played] == 2:                   # the move was taken back
+            affected.add(played)
         else:
-            move_list.sort()
-            move_list = [tuple(coord) for coord in move_list]
-        return move_list
+            cache[0].discard(played)
+            cache[1].discard(played)
+        profiler = self._profiler
+        for coord in changed:
+            for offset in offsets:
+                find_coord = coord + offset
+                tile = tiles[find_coord]
+                while tile < 2:                             # walk over Pieces to the first blank or border
+                    find_coord += offset
+                    tile = tiles[find_coord]
+                if profiler is not None:
+                    profiler.count("tiles scanned", (find_coord - coord) // offset)
+                if tile == 2:
+                    affected.add(find_coord)
+        for coord in affected:
+            for color in (0, 1):
+                if coord in frontier and self.is_valid_move(coord, color):
+                    cache[color].add(coord)
+                else:
+                    cache[color].discard(coord)
+        cache["sorted"] = {0: None, 1: None}
+        return
+
+    def is_valid_move(self, coord: int, color: int) -> bool:
+        """Return True if a blank Tile is a valid move for the color - in at least one direction there is an
+            unbroken line of opposing Pieces followed by one of the player's own Pieces
+        :param int coord: the Tile coordinate (x * 10 + y on 8x8) of the blank Tile
+        :param int color: the integer value for the current players color (0=black, 1=white)
+        :return bool: True if the move is valid
+        """
+        tiles = self._game["tiles"]
+        profiler = self._profiler
+        find_color = int(not color)
+        for offset in self._offsets:
+            find_coord = coord + offset
+            if tiles[find_coord] != find_color:
+                if profiler is not None:
+                    profiler.count("tiles scanned")
+                continue
+            find_coord += offset
+            tile = tiles[find_coord]
+            while tile == find_color:
+                find_coord += offset
+                tile = tiles[find_coord]
+            if profiler is not None:
+                profiler.count("tiles scanned", (find_coord - coord) // offset)
+            if tile == color:
+                return True
+        return False
 
     def positions_helper(self, x: int, y: int, direction: list, color: int):
         """Helper function that returns the first valid move of any directional sequence or None
@@ -270,71 +531,163 @@ class Othello:
         """
         find_color = not color                      # find pieces of the opposite color
         count = 1                                   # counts number of tiles moved
+        move = None
         x1, y1 = direction[0], direction[1]
-        while 0 < x < 9 and 0 < y < 9:              # keep moves on the board
+        edge, width = self._width - 1, self._width
+        while 0 < x < edge and 0 < y < edge:        # keep moves on the board
             x = x + x1
             y = y + y1
-            find_coord = x * 10 + y                 # calculate next move
-            tile = self._game["tiles"][find_coord].get_tile()
+            find_coord = x * width + y              # calculate next move
+            tile = self._game["tiles"][find_coord]
             if count == 1 and tile != find_color:   # if the first object is not a piece of opposing color - exit
-                return
+                break
             elif count > 1 and tile == 2:           # if first empty space after n number of opposing colors - return
-                return [x, y]
+                move = [x, y]
+                break
             elif tile == color or tile == 3:        # if a piece of own color or border - exit
-                return
+                break
             count += 1
+        if self._profiler is not None:
+            self._profiler.count("positions_helper squares", count)
+            self._profiler.count("tiles scanned", count)
+        return move
 
     def board_to_list(self) -> list:
-        """Return a nested list of string objects corresponding the current state of the Tile and Piece objects
+        """Return a nested list of string objects corresponding the current state of the Tiles
            --- used to generate the current state of self._board
         :return list output: a nested list matrix of the current state of all Tiles on the board
         """
+        if self._game["engine"] is not None:
+            return self._game["engine"].board_to_list()
         output = []
         nested = []
         symbol = ["X", "O", ".", "*"]
-        for item in self._game["tiles"]:
-            tile = self._game["tiles"][item].get_tile()
+        for item in range(len(self._game["tiles"])):
+            tile = self._game["tiles"][item]
             nested.append(symbol[tile])
-            if item % 10 == 9:
+            if item % self._width == self._width - 1:
                 output.append(nested)
                 nested = []
         return output
 
     def make_move(self, color: str, piece_position: tuple) -> list:         # REQUIRED
         """WARNING - METHOD ASSUMES THAT MOVES ENTERED ERROR-CHECKED/VALID BEFORE METHOD
-            --- From a given coordinate, use a helper method (flip_pieces) find the Piece objects that need to be
+            --- Play the move with make_move_delta
+            --- Return a list of the new board positions (the board property, built from the Tiles).
+            :param str color: the string value for the current players color (black or white)
+            :param tuple piece_position: the (x, y) coordinate of the move position
+            :return list self.board: the current state of the board
+            """
+        self.make_move_delta(color, piece_position)
+        return self.board
+
+    def make_move_delta(self, color: str, piece_position: tuple) -> list:
+        """WARNING - METHOD ASSUMES THAT MOVES ENTERED ERROR-CHECKED/VALID BEFORE METHOD
+            --- From a given coordinate, use a helper method (flip_pieces) find the Pieces that need to be
                     flipped in each direction from the newly played piece
-            --- Flip all the Piece objects found by the helper method
-            --- Generate the current state of the board and save to self._board
-            --- Return a list of the new board positions.
+            --- Flip all the Pieces found by the helper method
+            --- Mark the stored board as out of date instead of rebuilding it (see the board property)
+            --- Return only the changed squares, so callers that do not need the whole board can skip building it.
             :param str color: the string value for the current players color (black or white)
             :param tuple piece_position: the (x, y) coordinate of the move position
-            :return list self._board: the current state of the board
+            :return list changed: the (x, y) coordinates of the played piece followed by the flipped pieces
             """
-        position = piece_position[0] * 10 + piece_position[1]
-        tile = self._game["tiles"][position]
-        if type(tile.get_tile()) == int:
-            tile.set_piece(color)          # if empty tile, set new piece
-        else:
-            tile.flip_piece()              # else, flip piece on tile
+        self._board = None
+        self._game["history"].append((color, (piece_position[0], piece_position[1])))
+        if self._game["engine"] is not None:
+            self._game["piece_counter"] += 1
+            return self._game["engine"].make_move_delta(color, piece_position)
+        tiles = self._game["tiles"]
+        width = self._width
+        position = piece_position[0] * width + piece_position[1]
+        tiles[position] = 0 if color == "black" else 1          # set the new piece
+        self._game["piece_counter"] += 1
 
         # flips all valid lines between the played piece and existing pieces
+        changed = [position]
         directions = [[1, 0], [1, 1], [0, 1], [-1, 1], [0, -1], [-1, -1], [-1, 0], [1, -1]]
         for direction in directions:  # try moves in each direction
             flip_list = self.flip_piece(direction, piece_position, color)
             if flip_list:
                 for piece in flip_list:
-                    self._game["tiles"][piece].flip_piece()
-        self._board = self.board_to_list()
+                    if tiles[piece] < 2:        # blank Tiles in the list are skipped
+                        tiles[piece] ^= 1
+                        changed.append(piece)
+        self.update_move_cache(changed)
+        return [(coord // width, coord % width) for coord in changed]
+
+    def make_move_record(self, color: str, piece_position: tuple) -> dict:
+        """WARNING - METHOD ASSUMES THAT MOVES ENTERED ERROR-CHECKED/VALID BEFORE METHOD
+            Play a move with make_move_delta and return an undo record that unmake_move uses to restore the game
+            exactly as it was, so a search can walk the game tree without copying Othello objects.
+        :param str color: the string value for the current players color (black or white)
+        :param tuple piece_position: the (x, y) coordinate of the move position
+        :return dict: the undo record - the "color" that moved, the "changed" (x, y) coordinates from
+            make_move_delta, and the "piece_counter", "turn" and "no_moves" from before the move
+        """
+        record = {"color": color, "piece_counter": self._game["piece_counter"], "turn": self._game["turn"],
+                  "no_moves": self._game["no_moves"]}
+        record["changed"] = self.make_move_delta(color, piece_position)
+        return record
+
+    def unmake_move(self, record: dict) -> None:
+        """Take back the move described by an undo record from make_move_record.  Moves must be taken back in the
+            reverse order they were made.
+            --- Take the played Piece off its Tile and flip the flipped Pieces back
+            --- Restore the piece counter, turn and no_moves counter and update the move cache
+        :param dict record: the undo record returned by make_move_record
+        :return: None
+        """
+        self._board = None
+        self._game["history"].pop()
+        changed = record["changed"]
+        if self._game["engine"] is not None:
+            self._game["engine"].unmake_move_delta(record["color"], changed)
+        else:
+            tiles = self._game["tiles"]
+            width = self._width
+            tiles[changed[0][0] * width + changed[0][1]] = 2        # take the played piece off the board
+            for x, y in changed[1:]:
+                tiles[x * width + y] ^= 1
+            self.update_move_cache([x * width + y for x, y in changed])
+        self._game["piece_counter"] = record["piece_counter"]
+        self._game["turn"] = record["turn"]
+        self._game["no_moves"] = record["no_moves"]
+        return
+
+    def count_flips(self, color: str, piece_position: tuple) -> int:
+        """Return the number of Pieces a move would flip without playing it (uses the same scan as make_move)
+        :param str color: the string value for the current players color (black or white)
+        :param tuple piece_position: the (x, y) coordinate of the move position
+        :return int: the number of Pieces that would be flipped
+        """
+        if self._game["engine"] is not None:
+            return self._game["engine"].count_flips(color, piece_position)
+        count = 0
+        directions = [[1, 0], [1, 1], [0, 1], [-1, 1], [0, -1], [-1, -1], [-1, 0], [1, -1]]
+        for direction in directions:
+            flip_list = self.flip_piece(direction, piece_position, color)
+            if flip_list:
+                count += sum(1 for piece in flip_list if self._game["tiles"][piece] < 2)
+        return count
+
+    @property
+    def board(self) -> list:
+        """The nested list of what symbol exists at each [x, y] coordinate in the game (see board_to_list).  Moves
+            only mark the stored board as out of date - it is rebuilt the first time it is read after a move.
+        :return list: the current state of the board
+        """
+        if self._board is None:
+            self._board = self.board_to_list()
         return self._board
 
     def flip_piece(self, direction: list, piece_position: tuple, color: str):
-        """Helper function for make_move that will correctly flip all Piece objects in all directions between
+        """Helper function for make_move that will correctly flip all Pieces in all directions between
             the existing Pieces on the board and the latest played Piece.
         :param list direction: the current x,y coordinates of the direction to try
         :param list piece_position: the current x, y coordinates of the current position
         :param int color: the integer value for the current players color (0=black, 1=white)
-        :return flip_list: return a tuple of all Piece objects that need to be flipped for the given direction or None
+        :return flip_list: the coordinates of all Pieces that need to be flipped in the direction, or None
         """
         if color == "black":
             find_color = 1
@@ -343,14 +696,18 @@ class Othello:
         x, y = piece_position[0], piece_position[1]
         x1, y1 = direction[0], direction[1]
         flip_list = []
-        while 0 < x < 9 and 0 < y < 9:          # keep moves on the board
+        edge, width = self._width - 1, self._width
+        while 0 < x < edge and 0 < y < edge:    # keep moves on the board
             x = x + x1
             y = y + y1
-            find_coord = x * 10 + y             # calculate next move
-            tile = self._game["tiles"][find_coord]
-            if tile.get_tile() == (not find_color):
+            find_coord = x * width + y          # calculate next move
+            if self._game["tiles"][find_coord] == (not find_color):
+                if self._profiler is not None:
+                    self._profiler.count("flip_piece squares", len(flip_list) + 1)
                 return flip_list
             flip_list.append(find_coord)
+        if self._profiler is not None:
+            self._profiler.count("flip_piece squares", len(flip_list))
         return
 
     def play_game(self, player_color: str, piece_position: tuple):  # REQUIRED
@@ -365,11 +722,10 @@ class Othello:
         :return: None if a move is valid, "Invalid move" is a move is invalid
         """
         moves = []
-        if piece_position[0] > 9 or piece_position[1] > 9:
+        if piece_position[0] > self._width - 1 or piece_position[1] > self._width - 1:
             print(f"Invalid move. Here are the valid moves: {moves}")
             return "Invalid move"
-        coord = piece_position[0] * 10 + piece_position[1]
-        tile = self._game['tiles'][coord]
+        tile = self.get_tile(piece_position[0], piece_position[1])
         moves = self.return_available_positions(player_color)                         # get valid moves
         if not moves:                                                                 # if there are no valid moves
             if self._game["no_moves"] == 1:                                           # if both players have no moves
@@ -382,30 +738,42 @@ class Othello:
                 self._game["no_moves"] += 1
         else:
             self._game["no_moves"] = 0                                                # reset the moves counter
-        if piece_position not in moves or tile.get_tile() != 2:                       # if the move is not valid/empty
+        if piece_position not in moves or tile != 2:                       # if the move is not valid/empty
             print(f"Invalid move. Here are the valid moves: {moves}")
             return "Invalid move"
         else:
             self.make_move(player_color, piece_position)                              # make move
 
-    def auto(self) -> None:
+    def auto(self, computer: str = None, policy=None, time_limit: float = 1.0) -> None:
         """Uses existing methods to allow a game to be played between two players - ending the game when
-        there are no more moves for either player or no more pieces to play."""
+        there are no more moves for either player or no more pieces to play.  One of the players can be the
+        computer, which chooses its moves with a move policy (see selfplay.py) instead of input().
+        :param str computer: the color played by the computer ("black" or "white") or None for two players
+        :param policy: the computer's move policy - by default a SearchPolicy (see search.py)
+        :param float time_limit: the computer's time limit per move in seconds for the default policy
+        """
         self._game["auto"] = 1
         self._game["over"] = 0
-        name = input("Please enter the first players name: ")
-        self.create_player(name, "black")
-        name = input("Please enter the second players name: ")
-        self.create_player(name, "white")
+        if computer is not None and policy is None:
+            if self._size != 8:
+                raise ValueError("The search only plays 8x8 boards - pass a policy for other board sizes")
+            policy = SearchPolicy(time_limit)
+        if computer == "black":
+            self.create_player("Computer", "black")
+        else:
+            name = input("Please enter the first players name: ")
+            self.create_player(name, "black")
+        if computer == "white":
+            self.create_player("Computer", "white")
+        else:
+            name = input("Please enter the second players name: ")
+            self.create_player(name, "white")
         print("The first player will be black(X) and will go first.  "
               "The second player will be white(O) and will go second.\n"
               "Coordinates are based on zero indexed positions from the top left corner.")
-        players = {}
-        for player in self._game["players"]:
-            player_name, player_color = player.get_player()
-            players[player_color] = player_name
+        players = self.get_players()
         while not self._game["over"]:                       # run game until the game is over
-            if self._game["piece_counter"] == 62:  # if there are no more pieces to play
+            if self._game["piece_counter"] == self._geometry.game_over_pieces:  # if there are no more pieces
                 self._game["over"] = 1
                 black_count, white_count = self.return_winner_count()  # get/print counts
                 print("There are no more pieces to play.")
@@ -427,6 +795,14 @@ class Othello:
                 print_moves = (', '.join(map(str, moves)))
                 print(f"Your valid moves are: {print_moves}")
                 flag = 0
+                if color == computer:
+                    user_input = tuple(policy(self, color, moves))
+                    print(f"{players[color]}'s move is: {user_input}\n")
+                    if self.play_game(color, user_input) == "Invalid move":
+                        raise ValueError(f"The {color} policy returned {user_input}, which is not a valid move: "
+                                         f"{moves}")
+                    self._game["turn"] = not self._game["turn"]
+                    flag = 1
                 # NOTE - game over conditions are part of play_game and will toggle over flag
                 while not flag:
                     try:
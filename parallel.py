@@ -0,0 +1,252 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Parallel game tree search for the Othello class.  The moves at the root of the tree are split over a
+#               process pool, each worker searching its moves with its own Search and transposition table, so a
+#               move choice can use every core of the machine within the same time limit.
+
+"""ParallelSearch.best_move deepens one ply at a time like Search.best_move.  Each iteration searches the best move
+of the previous iteration first with a full window, then every other root move at once with a null window around
+its score, and finally re-searches (at once) the moves that came out better - principal variation search with the
+root moves as the unit of work.  An iteration that runs out of time is thrown away.
+
+Worker processes keep their Search, and so their transposition table, from task to task.  That makes a result
+depend on which worker searched which move before, so deterministic=True clears the worker's table before every
+task and ignores the time limit: every iteration up to max_depth is completed and the same position always gives
+the same move, score and node count, whatever the number of workers.  Since max_depth is then the only bound on
+the search, it must be given explicitly (a small depth - every ply costs several times the one before)."""
+
+import multiprocessing
+import time
+
+from bitboard import GAME_OVER_PIECES, coord, flip_mask, legal_moves
+from search import INFINITY, SCORE_DISC, WEIGHTS, Search, SearchTimeout
+
+_worker_search = None                               # the Search of this worker process (see _init_worker)
+
+
+def _init_worker(table_bits: int) -> None:
+    """Create the Search of a worker process"""
+    global _worker_search
+    _worker_search = Search(table_bits, endgame_empties=0)
+
+
+def _score_task(task: tuple) -> tuple:
+    """Search one root move in a worker process
+    :param tuple task: the bit index of the move, the black and white bitboards and color to move after it, the
+        depth, the (alpha, beta) window for the player to move after it, the time.monotonic() deadline (or None) and
+        whether to clear the transposition table first
+    :return tuple: the bit index, the score for the player to move after it (None if the time ran out) and the
+        number of nodes searched"""
+    index, black, white, color, depth, alpha, beta, deadline, clear = task
+    if clear:
+        _worker_search.clear()
+    try:
+        score = _worker_search.score(black, white, color, depth, alpha, beta, deadline=deadline)
+    except SearchTimeout:
+        score = None
+    return index, score, _worker_search.nodes
+
+
+class ParallelSearch:
+    """Represents a root-splitting searcher with a pool of worker processes.  Use it as a context manager, or call
+        close, to shut the pool down.
+    :param int workers: the number of worker processes (default: one per CPU core) - 1 searches in this process
+    :param bool deterministic: clear the tables before every task and ignore time limits (see the module docstring)
+        - best_move then needs an explicit max_depth
+    :param int table_bits: each worker's transposition table has 2 ** table_bits slots
+    :param int endgame_empties: positions with this many blank squares or fewer are solved exactly in this process
+        by a Search with an EndgameSolver
+    :ivar int nodes: the number of positions visited by the workers during the last call to best_move
+    """
+    def __init__(self, workers: int = None, deterministic: bool = False, table_bits: int = 18,
+                 endgame_empties: int = 12):
+        self.workers = multiprocessing.cpu_count() if workers is None else workers
+        self.deterministic = deterministic
+        self._table_bits = table_bits
+        self._endgame_empties = endgame_empties
+        self._pool = None
+        self._local = None
+        self.nodes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker processes
+        :return: None"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        return
+
+    def best_move(self, black: int, white: int, color: int, time_limit: float = 1.0, max_depth: int = None) -> tuple:
+        """Search a position with iterative deepening until the time limit or max_depth is reached
+        :param int black: the bitboard of black pieces
+        :param int white: the bitboard of white pieces
+        :param int color: the player to move (0 = black, 1 = white)
+        :param float time_limit: the wall-clock budget in seconds, or None to search to max_depth
+        :param int max_depth: the deepest iteration to search - 60 by default, required when deterministic (the
+            time limit is ignored, so it is the only bound on the search)
+        :return tuple: the best (x, y) move or None if there is no valid move, its score, and the completed depth
+        """
+        if max_depth is None:
+            if self.deterministic:
+                raise ValueError("A deterministic search ignores the time limit and needs an explicit max_depth")
+            max_depth = 60
+        own, opp = (white, black) if color else (black, white)
+        moves = legal_moves(own, opp)
+        self.nodes = 0
+        if not moves:
+            return None, None, 0
+        pieces = (own | opp).bit_count()
+        if 64 - pieces <= self._endgame_empties:
+            if self._local is None:
+                self._local = Search(self._table_bits, endgame_empties=self._endgame_empties)
+            result = self._local.best_move(black, white, color, time_limit, max_depth)
+            self.nodes = self._local.nodes
+            return result
+        if self.deterministic:
+            time_limit = None
+        start = time.monotonic()
+        deadline = None if time_limit is None else start + time_limit
+        children = {}
+        while moves:
+            low = moves & -moves
+            moves ^= low
+            index = low.bit_length() - 1
+            flips = flip_mask(own, opp, index)
+            new_own, new_opp = own | flips | low, opp & ~flips
+            children[index] = (new_opp, new_own) if color else (new_own, new_opp)
+        order = sorted(children, key=lambda index: (-WEIGHTS[index], index))
+        best, best_score, depth = order[0], None, 0
+        for iteration in range(1, max_depth + 1):
+            result = self._iteration(children, 1 - color, order, iteration, deadline)
+            if result is None:                      # out of time - keep the last completed iteration
+                break
+            best_score, order = result
+            best, depth = order[0], iteration
+            if abs(best_score) >= SCORE_DISC or pieces + iteration >= GAME_OVER_PIECES:
+                break
+            if time_limit is not None and time.monotonic() - start > time_limit / 3:
+                break
+        return coord(best), best_score, depth
+
+    def _iteration(self, children: dict, color: int, order: list, depth: int, deadline: float):
+        """Search every root move to a depth with principal variation search over the workers
+        :param dict children: bit index: (black, white) after the move
+        :param int color: the player to move after a root move
+        :param list order: the root moves, best first
+        :param int depth: the depth of the iteration
+        :param float deadline: the time.monotonic() time the move must be chosen by, or None - sent to the workers
+            as it is, so tasks that wait in the queue don't each get the whole budget again
+        :return: the best score and the root moves reordered best first, or None if the time ran out"""
+
+        def run(windows):
+            """Score (index, alpha, beta) root moves - alpha and beta are for the root player"""
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            tasks = [(index, children[index][0], children[index][1], color, depth - 1, -beta, -alpha, deadline,
+                      self.deterministic) for index, alpha, beta in windows]
+            scores = {}
+            for index, score, nodes in self._map(tasks):
+                self.nodes += nodes
+                if score is None:
+                    return None
+                scores[index] = -score
+            return scores
+
+        first = run([(order[0], -INFINITY, INFINITY)])
+        if first is None:
+            return None
+        alpha = first[order[0]]
+        scores = run([(index, alpha, alpha + 1) for index in order[1:]]) if len(order) > 1 else {}
+        if scores is None:
+            return None
+        better = [index for index in order[1:] if scores[index] > alpha]
+        if better:
+            exact = run([(index, alpha, INFINITY) for index in better])
+            if exact is None:
+                return None
+            scores.update(exact)
+        scores.update(first)
+        # best first; ties (and the moves only known to be no better than the best) keep their previous order
+        ranked = sorted(range(len(order)), key=lambda position: (-scores[order[position]], position))
+        new_order = [order[position] for position in ranked]
+        return scores[new_order[0]], new_order
+
+    def _map(self, tasks: list) -> list:
+        """Run search tasks on the workers (or in this process with one worker)
+        :param list tasks: the tasks for _score_task
+        :return list: the results, in task order"""
+        if self.workers == 1:
+            if _worker_search is None:
+                _init_worker(self._table_bits)
+            return [_score_task(task) for task in tasks]
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers, _init_worker, (self._table_bits,))
+        return self._pool.map(_score_task, tasks, chunksize=1)
+
+
+class ParallelSearchPolicy:
+    """Move policy (see selfplay.py) that chooses moves with a ParallelSearch.  The worker pool is started on first
+        use and is not sent along when the policy is pickled.  Use it as a context manager, or call close, to shut
+        the pool down when the game is over:
+
+        with ParallelSearchPolicy(1.0) as policy:
+            game.auto(computer="white", policy=policy)
+
+    :param float time_limit: the search budget per move in seconds
+    :param int workers: the number of worker processes (default: one per CPU core)
+    :param bool deterministic: see ParallelSearch - the time limit is then ignored, so max_depth must be given
+    :param int max_depth: the deepest iteration to search (default 60 - required when deterministic)
+    """
+    def __init__(self, time_limit: float = 1.0, workers: int = None, deterministic: bool = False,
+                 max_depth: int = None):
+        if deterministic and max_depth is None:
+            raise ValueError("A deterministic search ignores the time limit and needs an explicit max_depth")
+        self._time_limit = time_limit
+        self._workers = workers
+        self._deterministic = deterministic
+        self._max_depth = 60 if max_depth is None else max_depth
+        self._search = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker processes - a later move starts them again
+        :return: None"""
+        if self._search is not None:
+            self._search.close()
+            self._search = None
+        return
+
+    def __call__(self, game, color: str, moves: list) -> tuple:
+        """Return the move the search chooses for the player
+        :param Othello game: the game being played
+        :param str color: the color of the player to move
+        :param list moves: the valid moves for the player
+        :return tuple: the chosen move"""
+        if game.get_size() != 8:
+            raise ValueError(f"The search plays 8x8 boards only, not {game.get_size()}x{game.get_size()}")
+        if len(moves) == 1:
+            return moves[0]
+        if self._search is None:
+            self._search = ParallelSearch(self._workers, self._deterministic)
+        black, white = game.get_bitboards()
+        move, score, depth = self._search.best_move(black, white, int(color.lower() != "black"), self._time_limit,
+                                                    self._max_depth)
+        return move
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_search"] = None                     # worker pools can't be pickled - started again when used
+        return state
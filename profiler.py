@@ -0,0 +1,172 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Optional instrumentation for the hot paths of the Othello class.  A Profiler attached to a game
+#               counts the calls and squares walked by the move generation and flipping helpers, the pieces
+#               flipped per move and the board rebuilds, and keeps latency histograms of the board methods.
+
+"""Attach a Profiler with Othello.enable_profiling and read it back with snapshot() (a dict) or to_json():
+
+    profiler = game.enable_profiling()
+    game.make_move("black", (3, 4))
+    print(profiler.to_json())
+
+A game without a profiler pays nothing for the timers - they are wrappers set on the game object itself, so the
+class methods run untouched - and only a None check for the counters inside the Tile engine's helpers.  Counters
+and histograms are keyed by name, and reset() clears them, for example between games.
+
+Histograms use power of two buckets: a value v is counted in the bucket whose upper bound is the smallest power of
+two >= v (0 has its own bucket).  Latencies are recorded in nanoseconds."""
+
+import json
+import time
+
+# the Othello methods timed by an attached Profiler
+TIMED = ("return_available_positions", "scan_available_positions", "update_move_cache", "positions_helper",
+         "flip_piece", "make_move", "make_move_delta", "board_to_list")
+
+
+class Histogram:
+    """Represents a histogram of non-negative integer values in power of two buckets.
+    :ivar int count: the number of values recorded
+    :ivar int total: the sum of the values
+    """
+    __slots__ = ("buckets", "count", "total", "low", "high")
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.low = None
+        self.high = None
+
+    def add(self, value: int) -> None:
+        """Record one value
+        :param int value: the value
+        :return: None"""
+        bucket = (value - 1).bit_length() if value > 0 else -1
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.low is None or value < self.low:
+            self.low = value
+        if self.high is None or value > self.high:
+            self.high = value
+        return
+
+    def percentile(self, fraction: float) -> int:
+        """Return the upper bound of the bucket holding a percentile of the values (at most the largest value)
+        :param float fraction: the percentile as a fraction (0.5 = median)
+        :return int: the bucket's upper bound, or None if nothing has been recorded"""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return 0 if bucket < 0 else min(1 << bucket, self.high)
+        return self.high
+
+    def to_dict(self) -> dict:
+        """Return the histogram as a dict that can be written as JSON
+        :return dict: the "count", "total", "min", "max", "mean", "p50", "p99" and the "buckets" as
+            upper bound: count pairs"""
+        return {"count": self.count, "total": self.total, "min": self.low, "max": self.high,
+                "mean": self.total / self.count if self.count else None, "p50": self.percentile(0.5),
+                "p99": self.percentile(0.99),
+                "buckets": {str(0 if bucket < 0 else 1 << bucket): self.buckets[bucket]
+                            for bucket in sorted(self.buckets)}}
+
+
+class Profiler:
+    """Represents the counters and histograms collected from one or more Othello games.
+    :ivar dict counters: name: count pairs
+    :ivar dict histograms: name: Histogram pairs
+    """
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a counter
+        :param str name: the counter
+        :param int amount: the amount to add
+        :return: None"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+        return
+
+    def observe(self, name: str, value: int) -> None:
+        """Record a value in a histogram
+        :param str name: the histogram
+        :param int value: the value
+        :return: None"""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(value)
+        return
+
+    def reset(self) -> None:
+        """Clear every counter and histogram
+        :return: None"""
+        self.counters = {}
+        self.histograms = {}
+        return
+
+    def snapshot(self) -> dict:
+        """Return the counters and histograms as a dict that can be written as JSON
+        :return dict: {"counters": {name: count}, "histograms": {name: Histogram.to_dict()}}"""
+        return {"counters": dict(sorted(self.counters.items())),
+                "histograms": {name: self.histograms[name].to_dict() for name in sorted(self.histograms)}}
+
+    def to_json(self, indent: int = 2) -> str:
+        """Return snapshot() as a JSON string
+        :param int indent: the JSON indent
+        :return str: the JSON"""
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def attach(self, game) -> None:
+        """Start profiling a game: set timing wrappers for the TIMED methods on the game object and point the
+            game's helpers at this profiler
+        :param Othello game: the game
+        :return: None"""
+        for name in TIMED:
+            setattr(game, name, self._timed(game, name, getattr(type(game), name).__get__(game)))
+        game._profiler = self
+        return
+
+    @staticmethod
+    def detach(game) -> None:
+        """Stop profiling a game and restore its class methods
+        :param Othello game: the game
+        :return: None"""
+        for name in TIMED:
+            game.__dict__.pop(name, None)
+        game._profiler = None
+        return
+
+    def _timed(self, game, name: str, method):
+        """Return a wrapper for a bound method that counts its calls and records its latency.  The wrappers for
+            make_move_delta and return_available_positions also record the pieces flipped and the tiles scanned
+            by the move cache per call."""
+        clock = time.perf_counter_ns
+        latency = name + " ns"
+        calls = name + " calls"
+        scanned_name = name + " tiles scanned"
+
+        def timed(*args, **kwargs):
+            counters = self.counters
+            scanned = counters.get("tiles scanned", 0)
+            start = clock()
+            result = method(*args, **kwargs)
+            self.observe(latency, clock() - start)
+            counters[calls] = counters.get(calls, 0) + 1
+            if name == "make_move_delta":
+                self.count("make_move flips", len(result) - 1)
+                self.observe("make_move flips", len(result) - 1)
+            if name in ("make_move_delta", "return_available_positions") and game._game["engine"] is None:
+                self.observe(scanned_name, counters.get("tiles scanned", 0) - scanned)
+            return result
+        timed.__wrapped__ = method
+        return timed
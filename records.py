@@ -0,0 +1,158 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Compact binary archive of finished Othello games.  Each game is stored as a small header (the final
+#               counts and the player names) followed by one byte per move.  Archives are appended to one game at
+#               a time and read back through a memory map as a stream of games.
+
+"""Archive layout: the 4 byte MAGIC, then one record per game:
+
+    black count (1 byte), white count (1 byte), black name length (1 byte), white name length (1 byte),
+    number of moves (1 byte), black name (UTF-8), white name (UTF-8), moves (1 byte each)
+
+A move byte is the bitboard.py square index (x - 1) * 8 + (y - 1) of the move, or PASS for a turn where the player
+to move had no valid move.  Black moves first and the players alternate, so colors are not stored."""
+
+import mmap
+import os
+import struct
+
+from bitboard import coord, square
+from othello import Othello
+
+MAGIC = b"OTH1"
+PASS = 64
+HEADER = struct.Struct("<5B")
+
+# DECODE[byte] is the (x, y) move for a move byte, or None for PASS
+DECODE = [coord(index) for index in range(64)] + [None]
+
+
+def encode_moves(moves: list) -> bytes:
+    """Encode a move list (x, y tuples, with None for a pass) as one byte per move.  Archives hold 8x8 games only.
+    :param list moves: the moves
+    :return bytes: the encoded moves"""
+    for move in moves:
+        if move is not None and not (1 <= move[0] <= 8 and 1 <= move[1] <= 8):
+            raise ValueError(f"{move} is not a square of the 8x8 board - archives hold 8x8 games only")
+    return bytes(PASS if move is None else square(move[0], move[1]) for move in moves)
+
+
+def moves_from_history(history: list) -> list:
+    """Turn the (color, (x, y)) pairs from Othello.get_history into a move list, adding a pass wherever the same
+        color moved twice in a row (or white moved first)
+    :param list history: the history
+    :return list: the moves, with None for a pass"""
+    moves = []
+    to_move = "black"
+    for color, move in history:
+        if color != to_move:
+            moves.append(None)
+        moves.append(move)
+        to_move = "white" if color == "black" else "black"
+    return moves
+
+
+class RecordWriter:
+    """Represents an archive file opened for appending games.  Use it as a context manager, or call close.
+    :param str path: the archive file - created with the MAGIC header if it does not exist
+    """
+    def __init__(self, path: str):
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Flush and close the archive
+        :return: None"""
+        self._file.close()
+        return
+
+    def write(self, moves: list, black_count: int, white_count: int, black_name: str = "",
+              white_name: str = "") -> None:
+        """Append one game to the archive
+        :param list moves: the moves of the game as (x, y) tuples, with None for a pass (at most 255)
+        :param int black_count: the final number of black pieces
+        :param int white_count: the final number of white pieces
+        :param str black_name: the name of the black player (at most 255 bytes of UTF-8)
+        :param str white_name: the name of the white player (at most 255 bytes of UTF-8)
+        :return: None"""
+        # cut on a character boundary, so a long non-ASCII name still decodes
+        black_name = black_name.encode()[:255].decode("utf-8", "ignore").encode()
+        white_name = white_name.encode()[:255].decode("utf-8", "ignore").encode()
+        data = encode_moves(moves)
+        if len(data) > 255:
+            raise ValueError(f"A game can have at most 255 moves, not {len(data)}")
+        self._file.write(HEADER.pack(black_count, white_count, len(black_name), len(white_name), len(data)))
+        self._file.write(black_name + white_name + data)
+        self.count += 1
+        return
+
+    def write_game(self, game: Othello) -> None:
+        """Append an Othello game to the archive, using its history, players and return_winner_count
+        :param Othello game: the game - on the 8x8 board
+        :return: None"""
+        if game.get_size() != 8:
+            raise ValueError(f"Archives hold 8x8 games only, not {game.get_size()}x{game.get_size()}")
+        black_count, white_count = game.return_winner_count()
+        players = game.get_players()
+        self.write(moves_from_history(game.get_history()), black_count, white_count, players.get("black", ""),
+                   players.get("white", ""))
+        return
+
+
+def replay(moves: list, engine: str = "bitboard") -> Othello:
+    """Play a move list on a new Othello game with make_move_delta
+    :param list moves: the moves as (x, y) tuples, with None for a pass
+    :param str engine: the Othello engine to play on
+    :return Othello: the game after the last move"""
+    game = Othello(engine=engine)
+    color = "black"
+    for move in moves:
+        if move is not None:
+            game.make_move_delta(color, move)
+        color = "white" if color == "black" else "black"
+    return game
+
+
+def read_games(path: str, replay_engine: str = None):
+    """Stream the games in an archive.  The file is memory mapped, so only the pages being read are loaded and
+        archives of any size can be read with constant memory.
+    :param str path: the archive file
+    :param str replay_engine: if given, each game is also replayed on an Othello object with this engine
+    :return: a generator of dicts with the "players" (color: name), the final "black" and "white" counts, the
+        "moves" (x, y tuples, with None for a pass) and, when replaying, the "game" Othello object - ValueError
+        is raised at a record cut short (for example by an interrupted append), after the complete games before it
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a game archive")
+        position = len(MAGIC)
+        end = len(data)
+        while position < end:
+            if position + HEADER.size > end:
+                raise ValueError(f"{path} ends with a truncated game record at byte {position}")
+            black_count, white_count, black_length, white_length, count = HEADER.unpack_from(data, position)
+            if position + HEADER.size + black_length + white_length + count > end:
+                raise ValueError(f"{path} ends with a truncated game record at byte {position}")
+            position += HEADER.size
+            black_name = data[position:position + black_length].decode("utf-8", "replace")
+            position += black_length
+            white_name = data[position:position + white_length].decode("utf-8", "replace")
+            position += white_length
+            moves = [DECODE[byte] for byte in data[position:position + count]]
+            position += count
+            record = {"players": {"black": black_name, "white": white_name}, "black": black_count,
+                      "white": white_count, "moves": moves}
+            if replay_engine is not None:
+                record["game"] = replay(moves, replay_engine)
+            yield record
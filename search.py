@@ -0,0 +1,342 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Computer opponent for the Othello class.  Searches the game tree with negamax and alpha-beta pruning,
+#               deepening one ply at a time until a wall-clock budget runs out, and remembers searched positions in
+#               a Zobrist-hashed transposition table.
+
+"""Positions are searched as (own, opp) bitboards from bitboard.py, so the search follows exactly the same move and
+flip rules as Othello.return_available_positions and Othello.make_move.  Scores are from the point of view of the
+player to move: heuristic scores for unfinished games, and SCORE_DISC times the final disc difference for finished
+ones, so any won game scores above any heuristic score."""
+
+import random
+import time
+
+from bitboard import GAME_OVER_PIECES, coord, flip_mask, legal_moves
+from endgame import EndgameSolver
+
+SCORE_DISC = 10000                  # score of one disc of difference in a finished game
+INFINITY = 1000000
+
+EXACT, LOWER, UPPER = 0, 1, 2       # transposition table bound types
+
+CORNERS = 0x8100000000000081
+
+# square weights for the heuristic evaluation - corners are good, the squares next to them are bad
+WEIGHTS = [
+    100, -20, 10, 5, 5, 10, -20, 100,
+    -20, -50, -2, -2, -2, -2, -50, -20,
+    10, -2, 1, 1, 1, 1, -2, 10,
+    5, -2, 1, 0, 0, 1, -2, 5,
+    5, -2, 1, 0, 0, 1, -2, 5,
+    10, -2, 1, 1, 1, 1, -2, 10,
+    -20, -50, -2, -2, -2, -2, -50, -20,
+    100, -20, 10, 5, 5, 10, -20, 100,
+]
+
+# WEIGHT_ROWS[row][byte] is the summed weight of the squares set in one row (eight bits) of a bitboard
+WEIGHT_ROWS = [[sum(WEIGHTS[row * 8 + bit] for bit in range(8) if value >> bit & 1) for value in range(256)]
+               for row in range(8)]
+
+
+def _zobrist_tables() -> tuple:
+    """Build the Zobrist keys with a fixed seed, so hashes are the same in every process
+    :return tuple: per-square keys for each color, byte tables for hashing flipped squares, and the side key"""
+    rng = random.Random(20230518)
+    squares = [[rng.getrandbits(64) for _ in range(64)] for _ in range(2)]
+    # a flip toggles a square between colors, so its key is the black key XOR the white key
+    flip_rows = [[0] * 256 for _ in range(8)]
+    for row in range(8):
+        for value in range(256):
+            key = 0
+            for bit in range(8):
+                if value >> bit & 1:
+                    key ^= squares[0][row * 8 + bit] ^ squares[1][row * 8 + bit]
+            flip_rows[row][value] = key
+    return squares, flip_rows, rng.getrandbits(64)
+
+
+ZOBRIST, ZOBRIST_FLIPS, ZOBRIST_SIDE = _zobrist_tables()
+
+
+def zobrist(black: int, white: int, color: int) -> int:
+    """Return the Zobrist hash of a position
+    :param int black: the bitboard of black pieces
+    :param int white: the bitboard of white pieces
+    :param int color: the player to move (0 = black, 1 = white)
+    :return int: the 64-bit hash"""
+    key = ZOBRIST_SIDE if color else 0
+    for index in range(64):
+        if black >> index & 1:
+            key ^= ZOBRIST[0][index]
+        elif white >> index & 1:
+            key ^= ZOBRIST[1][index]
+    return key
+
+
+def flip_key(flips: int) -> int:
+    """Return the Zobrist key change for flipping every square set in a bitboard
+    :param int flips: the bitboard of flipped squares
+    :return int: the key to XOR into the hash"""
+    key = 0
+    row = 0
+    while flips:
+        key ^= ZOBRIST_FLIPS[row][flips & 255]
+        flips >>= 8
+        row += 1
+    return key
+
+
+def final_score(own: int, opp: int) -> int:
+    """Return the score of a finished game for the player to move
+    :param int own: the bitboard of the player to move
+    :param int opp: the bitboard of the opponent
+    :return int: SCORE_DISC times the disc difference"""
+    return SCORE_DISC * (own.bit_count() - opp.bit_count())
+
+
+def evaluate(own: int, opp: int) -> int:
+    """Heuristic score of an unfinished game for the player to move: square weights plus mobility
+    :param int own: the bitboard of the player to move
+    :param int opp: the bitboard of the opponent
+    :return int: the score"""
+    score = 0
+    for row in range(8):
+        score += WEIGHT_ROWS[row][own >> (row * 8) & 255] - WEIGHT_ROWS[row][opp >> (row * 8) & 255]
+    return score + 10 * (legal_moves(own, opp).bit_count() - legal_moves(opp, own).bit_count())
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out - the current iteration is abandoned"""
+
+
+class Search:
+    """Represents an alpha-beta searcher with its transposition table.  Keep one Search per computer player so
+        the table carries over from move to move.  The table has a fixed number of slots, indexed by the low bits
+        of the Zobrist hash; a new entry replaces an old one when the old one is from an earlier search or was
+        searched to the same or a smaller depth.
+    :param int table_bits: the transposition table has 2 ** table_bits slots
+    :param evaluate: the heuristic function evaluate(own, opp) used at the search horizon
+    :param int endgame_empties: positions with this many blank squares or fewer are solved exactly by an
+        EndgameSolver (see endgame.py) instead of searched - 0 turns the solver off
+    :ivar int nodes: the number of positions visited by the last call to best_move
+    """
+    def __init__(self, table_bits: int = 18, evaluate=evaluate, endgame_empties: int = 12):
+        self._mask = (1 << table_bits) - 1
+        self._table = [None] * (1 << table_bits)
+        self._endgame_empties = endgame_empties
+        self._endgame = EndgameSolver() if endgame_empties > 0 else None
+        self._generation = 0
+        self._evaluate = evaluate
+        self._deadline = None
+        self.nodes = 0
+
+    def clear(self) -> None:
+        """Empty the transposition table
+        :return: None"""
+        self._table = [None] * (self._mask + 1)
+        return
+
+    def best_move(self, black: int, white: int, color: int, time_limit: float = 1.0, max_depth: int = 60) -> tuple:
+        """Search a position with iterative deepening until the time limit or max_depth is reached
+        :param int black: the bitboard of black pieces
+        :param int white: the bitboard of white pieces
+        :param int color: the player to move (0 = black, 1 = white)
+        :param float time_limit: the wall-clock budget in seconds, or None to search to max_depth
+        :param int max_depth: the deepest iteration to search
+        :return tuple: the best (x, y) move or None if there is no valid move, its score, and the completed depth
+        """
+        own, opp = (white, black) if color else (black, white)
+        moves = legal_moves(own, opp)
+        self.nodes = 0
+        if not moves:
+            return None, None, 0
+        empties = 64 - (own | opp).bit_count()
+        if empties <= self._endgame_empties:        # solved exactly, ignoring the time limit
+            score, move = self._endgame.solve(black, white, color)
+            self.nodes = self._endgame.nodes
+            return move, SCORE_DISC * score, empties
+        start = time.monotonic()
+        self._deadline = None if time_limit is None else start + time_limit
+        self._generation += 1
+        key = zobrist(black, white, color)
+        best, best_score, depth = (moves & -moves).bit_length() - 1, None, 0
+        for iteration in range(1, max_depth + 1):
+            try:
+                score, move = self._root(own, opp, color, key, iteration, best)
+            except SearchTimeout:
+                break
+            best, best_score, depth = move, score, iteration
+            if abs(score) >= SCORE_DISC or (own | opp).bit_count() + iteration >= GAME_OVER_PIECES:
+                break                               # the game tree has been searched to the end
+            # the next iteration takes several times longer, so don't start one that can't finish
+            if self._deadline is not None and time.monotonic() - start > time_limit / 3:
+                break
+        self._deadline = None
+        return coord(best), best_score, depth
+
+    def score(self, black: int, white: int, color: int, depth: int, alpha: int = -INFINITY, beta: int = INFINITY,
+              time_limit: float = None, deadline: float = None) -> int:
+        """Search a position to a fixed depth and return its score (see parallel.py, which scores root moves in
+            worker processes with this)
+        :param int black: the bitboard of black pieces
+        :param int white: the bitboard of white pieces
+        :param int color: the player to move (0 = black, 1 = white)
+        :param int depth: the number of plies to search
+        :param int alpha: the score the player to move is already guaranteed
+        :param int beta: the score the opponent is already guaranteed
+        :param float time_limit: the wall-clock budget in seconds, or None for no limit - SearchTimeout is raised
+            when it runs out
+        :param float deadline: the time.monotonic() time to stop at instead of a time limit - the same clock in
+            every process, so a task that waited in a queue doesn't get the whole budget again
+        :return int: the score for the player to move, exact if it is inside (alpha, beta) and a bound otherwise"""
+        own, opp = (white, black) if color else (black, white)
+        self.nodes = 0
+        self._generation += 1
+        if deadline is None and time_limit is not None:
+            deadline = time.monotonic() + time_limit
+        if deadline is not None and time.monotonic() >= deadline:
+            raise SearchTimeout
+        self._deadline = deadline
+        try:
+            return self._negamax(own, opp, color, zobrist(black, white, color), depth, alpha, beta)
+        finally:
+            self._deadline = None
+
+    def _root(self, own: int, opp: int, color: int, key: int, depth: int, first: int) -> tuple:
+        """Search the root position to a depth, trying the previous iteration's best move first
+        :return tuple: the score and bit index of the best move"""
+        alpha, beta = -INFINITY, INFINITY
+        best, best_score = first, -INFINITY
+        for index in self._order(own, opp, legal_moves(own, opp), first, depth):
+            flips = flip_mask(own, opp, index)
+            child = key ^ ZOBRIST_SIDE ^ ZOBRIST[color][index] ^ flip_key(flips)
+            score = -self._negamax(opp & ~flips, own | flips | (1 << index), 1 - color, child, depth - 1,
+                                   -beta, -alpha)
+            if score > best_score:
+                best, best_score = index, score
+                alpha = max(alpha, score)
+        self._store(key, depth, EXACT, best_score, best)
+        return best_score, best
+
+    def _negamax(self, own: int, opp: int, color: int, key: int, depth: int, alpha: int, beta: int) -> int:
+        """Return the negamax score of a position within the (alpha, beta) window
+        :param int own: the bitboard of the player to move
+        :param int opp: the bitboard of the opponent
+        :param int color: the player to move (0 = black, 1 = white)
+        :param int key: the Zobrist hash of the position
+        :param int depth: the number of plies left to search
+        :param int alpha: the score the player to move is already guaranteed
+        :param int beta: the score the opponent is already guaranteed
+        :return int: the score for the player to move"""
+        self.nodes += 1
+        if not self.nodes & 1023 and self._deadline is not None and time.monotonic() > self._deadline:
+            raise SearchTimeout
+        if (own | opp).bit_count() >= GAME_OVER_PIECES:
+            return final_score(own, opp)
+        entry = self._table[key & self._mask]
+        tt_move = -1
+        if entry is not None and entry[0] == key:
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                if entry[2] == EXACT:
+                    return entry[3]
+                if entry[2] == LOWER and entry[3] >= beta:
+                    return entry[3]
+                if entry[2] == UPPER and entry[3] <= alpha:
+                    return entry[3]
+        moves = legal_moves(own, opp)
+        if not moves:
+            if not legal_moves(opp, own):
+                return final_score(own, opp)
+            return -self._negamax(opp, own, 1 - color, key ^ ZOBRIST_SIDE, depth, -beta, -alpha)   # pass
+        if depth == 0:
+            return self._evaluate(own, opp)
+        alpha_start = alpha
+        best, best_score = -1, -INFINITY
+        for index in self._order(own, opp, moves, tt_move, depth):
+            flips = flip_mask(own, opp, index)
+            child = key ^ ZOBRIST_SIDE ^ ZOBRIST[color][index] ^ flip_key(flips)
+            score = -self._negamax(opp & ~flips, own | flips | (1 << index), 1 - color, child, depth - 1,
+                                   -beta, -alpha)
+            if score > best_score:
+                best, best_score = index, score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        if best_score <= alpha_start:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._store(key, depth, flag, best_score, best)
+        return best_score
+
+    def _order(self, own: int, opp: int, moves: int, first: int, depth: int) -> list:
+        """Return the bit indexes of the moves in search order: the transposition table move, then corners, then
+            (far enough from the horizon to be worth it) the moves that leave the opponent the fewest replies
+        :return list: the ordered bit indexes"""
+        ordered = []
+        while moves:
+            low = moves & -moves
+            index = low.bit_length() - 1
+            moves ^= low
+            if index == first:
+                priority = -INFINITY
+            elif low & CORNERS:
+                priority = -1000
+            elif depth >= 3:
+                flips = flip_mask(own, opp, index)
+                priority = legal_moves(opp & ~flips, own | flips | low).bit_count() * 10 - WEIGHTS[index]
+            else:
+                priority = -WEIGHTS[index]
+            ordered.append((priority, index))
+        ordered.sort()
+        return [index for priority, index in ordered]
+
+    def _store(self, key: int, depth: int, flag: int, score: int, move: int) -> None:
+        """Store a search result, replacing the slot's entry if it is from an earlier search or not deeper"""
+        slot = key & self._mask
+        entry = self._table[slot]
+        if entry is None or entry[5] != self._generation or entry[1] <= depth:
+            self._table[slot] = (key, depth, flag, score, move, self._generation)
+        return
+
+
+class SearchPolicy:
+    """Move policy (see selfplay.py) that chooses moves with a Search.  The Search is created on first use, so the
+        policy can be sent to worker processes before its transposition table is allocated.
+    :param float time_limit: the search budget per move in seconds
+    :param int max_depth: the deepest iteration to search
+    :param int table_bits: the transposition table has 2 ** table_bits slots
+    :param int endgame_empties: solve positions with this many blank squares or fewer exactly (0 = never)
+    :param evaluate: the heuristic function evaluate(own, opp) - for example an evaluator.PatternEvaluator
+    """
+    def __init__(self, time_limit: float = 1.0, max_depth: int = 60, table_bits: int = 18,
+                 endgame_empties: int = 12, evaluate=evaluate):
+        self._time_limit = time_limit
+        self._max_depth = max_depth
+        self._table_bits = table_bits
+        self._endgame_empties = endgame_empties
+        self._evaluate = evaluate
+        self._search = None
+
+    def __call__(self, game, color: str, moves: list) -> tuple:
+        """Return the move the search chooses for the player
+        :param Othello game: the game being played
+        :param str color: the color of the player to move
+        :param list moves: the valid moves for the player
+        :return tuple: the chosen move"""
+        if game.get_size() != 8:
+            raise ValueError(f"The search plays 8x8 boards only, not {game.get_size()}x{game.get_size()}")
+        if len(moves) == 1:
+            return moves[0]
+        if self._search is None:
+            self._search = Search(self._table_bits, self._evaluate, self._endgame_empties)
+        black, white = game.get_bitboards()
+        move, score, depth = self._search.best_move(black, white, int(color.lower() != "black"), self._time_limit,
+                                                    self._max_depth)
+        return move
@@ -0,0 +1,159 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Plays complete Othello games between move policies without input() or print(), spreading the
+#               games over a process pool and yielding each result as soon as its game finishes.
+
+"""A move policy is any callable policy(game, color, moves) that returns one of the (x, y) tuples in moves, where
+game is the Othello object, color is "black" or "white" and moves is game.return_available_positions(color).
+Policies are passed to worker processes, so they must be picklable (module level functions or objects of module
+level classes).  The random module is seeded once per game, so random policies replay exactly for the same seed."""
+
+import argparse
+import multiprocessing
+import random
+
+from othello import SIZES, Othello
+
+
+def random_policy(game: Othello, color: str, moves: list) -> tuple:
+    """Policy that plays a random valid move
+    :param Othello game: the game being played
+    :param str color: the color of the player to move
+    :param list moves: the valid moves for the player
+    :return tuple: the chosen move"""
+    return random.choice(moves)
+
+
+def greedy_policy(game: Othello, color: str, moves: list) -> tuple:
+    """Policy that plays the move that flips the most pieces (the first one in sorted order on a tie)
+    :param Othello game: the game being played
+    :param str color: the color of the player to move
+    :param list moves: the valid moves for the player
+    :return tuple: the chosen move"""
+    return max(moves, key=lambda move: game.count_flips(color, move))
+
+
+POLICIES = {"random": random_policy, "greedy": greedy_policy}
+
+
+def get_policy(policy):
+    """Return the policy callable for a policy name in POLICIES, or the policy itself if it is already callable
+    :param policy: a policy name or a policy callable
+    :return: the policy callable"""
+    if callable(policy):
+        return policy
+    if policy not in POLICIES:
+        raise ValueError(f'Unknown policy "{policy}".  The policy must be one of {sorted(POLICIES)} or a callable')
+    return POLICIES[policy]
+
+
+def play_one(black, white, engine: str = "bitboard", seed=None, size: int = 8) -> dict:
+    """Play one complete game between two policies.  The game ends, as in Othello.auto, when neither player has a
+        valid move or when 62 pieces have been played (all but two squares on other board sizes).
+    :param black: the policy (name or callable) for the black player, who moves first
+    :param white: the policy (name or callable) for the white player
+    :param str engine: the Othello engine to play on ("tiles" or "bitboard")
+    :param seed: the seed for the random module, or None to leave it as is
+    :param int size: the board size (see othello.SIZES)
+    :return dict: the final "black" and "white" counts (from return_winner_count), the "winner" ("black", "white"
+        or "tie") and the list of "moves" played, with None for a turn that was passed
+    """
+    if seed is not None:
+        random.seed(seed)
+    policies = {"black": get_policy(black), "white": get_policy(white)}
+    game = Othello(engine=engine, size=size)
+    for policy, policy_color in ((black, "black"), (white, "white")):
+        name = policy if isinstance(policy, str) else getattr(policy, "__name__", type(policy).__name__)
+        game.create_player(name, policy_color)
+    color = "black"
+    passes = 0
+    moves = []
+    game_over = game.get_game_over_pieces()
+    while passes < 2 and game.get_piece_counter() < game_over:
+        available = game.return_available_positions(color)
+        if available:
+            passes = 0
+            move = tuple(policies[color](game, color, available))
+            if move not in available:
+                raise ValueError(f"The {color} policy returned {move}, which is not a valid move: {available}")
+            game.make_move_delta(color, move)
+            moves.append(move)
+        else:
+            passes += 1
+            moves.append(None)
+        color = "white" if color == "black" else "black"
+    while moves and moves[-1] is None:              # the passes that ended the game are not moves
+        moves.pop()
+    black_count, white_count = game.return_winner_count()
+    if black_count > white_count:
+        winner = "black"
+    elif black_count == white_count:
+        winner = "tie"
+    else:
+        winner = "white"
+    return {"black": black_count, "white": white_count, "winner": winner, "moves": moves}
+
+
+def _play_task(task: tuple) -> dict:
+    """Worker entry point for run_games: play one game and tag the result with its game number
+    :param tuple task: (game number, black policy, white policy, engine, seed, board size)
+    :return dict: the result from play_one with a "game" key added"""
+    number, black, white, engine, seed, size = task
+    result = play_one(black, white, engine, seed, size)
+    result["game"] = number
+    return result
+
+
+def run_games(games: int, black="random", white="random", workers=None, engine: str = "bitboard", seed=None,
+              chunksize=None, size: int = 8):
+    """Play a number of games between two policies over a process pool, yielding the result of each game (see
+        play_one) as it finishes.  Results arrive in finishing order - use the "game" key to put them in order.
+    :param int games: the number of games to play
+    :param black: the policy (name or callable) for the black player
+    :param white: the policy (name or callable) for the white player
+    :param workers: the number of worker processes (default: one per CPU core) - 1 plays every game in this process
+    :param str engine: the Othello engine to play on ("tiles" or "bitboard")
+    :param seed: base seed - game n is played with seed + n, so a run can be replayed exactly - or None
+    :param chunksize: the number of games sent to a worker at a time (default: sized from games and workers)
+    :param int size: the board size (see othello.SIZES)
+    :return: a generator of result dicts
+    """
+    get_policy(black)                                   # fail here rather than in every worker
+    get_policy(white)
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    tasks = ((number, black, white, engine, None if seed is None else seed + number, size)
+             for number in range(games))
+    if workers == 1:
+        for task in tasks:
+            yield _play_task(task)
+        return
+    if chunksize is None:
+        chunksize = max(1, min(256, games // (workers * 8)))
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(_play_task, tasks, chunksize):
+            yield result
+
+
+def main():
+    """Play games from the command line and print a summary of the results"""
+    parser = argparse.ArgumentParser(description="Play Othello games between two policies.")
+    parser.add_argument("games", type=int, help="number of games to play")
+    parser.add_argument("--black", default="random", choices=sorted(POLICIES))
+    parser.add_argument("--white", default="random", choices=sorted(POLICIES))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--engine", default="bitboard", choices=["tiles", "bitboard"])
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--size", type=int, default=8, choices=SIZES)
+    args = parser.parse_args()
+    wins = {"black": 0, "white": 0, "tie": 0}
+    for result in run_games(args.games, args.black, args.white, args.workers, args.engine, args.seed,
+                            size=args.size):
+        wins[result["winner"]] += 1
+    print(f"black ({args.black}) wins: {wins['black']}  white ({args.white}) wins: {wins['white']}  "
+          f"ties: {wins['tie']}")
+
+
+if __name__ == "__main__":
+    main()
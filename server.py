@@ -0,0 +1,318 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: asyncio game server for the Othello class.  One process hosts many games at once behind a session
+#               manager, and clients play them over a line protocol on a TCP or Unix socket instead of through the
+#               input() and print() loop of Othello.auto.
+
+"""Every request is one line of words separated by spaces and gets exactly one response line, starting with OK,
+OVER (the request ended the game) or ERR.  Games are identified by the id NEW returns, so one connection can play
+several games and two connections can share one game.
+
+    NEW [tiles|bitboard]            OK <game id>
+    PLAYER <id> <name> <color>      OK                          (Othello.create_player)
+    MOVE <id> <color> <x> <y>       OK | OVER <result>          (Othello.play_game)
+    PASS <id> <color>               OK | OVER <result>          (the player to move has no valid move)
+    MOVES <id> <color>              OK <x>,<y> <x>,<y> ...      (Othello.return_available_positions)
+    BOARD <id>                      OK <8 rows of X, O and . separated by />
+    TURN <id>                       OK <color to move>
+    COUNT <id>                      OK <black count> <white count>
+    CLOSE <id>                      OK
+    QUIT                            OK, then the server closes the connection
+
+Players must alternate, black first, and a game ends when neither player has a valid move or when 62 pieces have
+been played, the same as Othello.auto.  Anything play_game or create_player prints is sent back as the text of the
+response.  Games that receive no requests for idle_timeout seconds are evicted.  Each connection handles its
+requests one at a time and waits for the client to read its responses before reading more, so a client that sends
+faster than it reads is slowed down instead of filling the server's memory."""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import time
+
+from bitboard import GAME_OVER_PIECES
+from othello import Othello
+
+SYMBOLS = "XO.*"
+
+
+class Session:
+    """Represents one hosted game.
+    :param str session_id: the game id
+    :param Othello game: the game
+    :ivar str turn: the color of the player to move
+    :ivar bool over: True once the game has ended
+    :ivar float last_used: the time.monotonic() of the last request for the game
+    """
+    __slots__ = ("session_id", "game", "turn", "over", "last_used")
+
+    def __init__(self, session_id: str, game: Othello):
+        self.session_id = session_id
+        self.game = game
+        self.turn = "black"
+        self.over = False
+        self.last_used = time.monotonic()
+
+
+class SessionManager:
+    """Represents the games hosted by a server and the commands that run on them.
+    :param int max_sessions: the most games hosted at once - NEW fails beyond it
+    :param float idle_timeout: games idle for longer than this many seconds are evicted by evict_idle
+    :param str engine: the default Othello engine for NEW
+    """
+    def __init__(self, max_sessions: int = 10000, idle_timeout: float = 300.0, engine: str = "bitboard"):
+        self._sessions = {}
+        self._ids = itertools.count(1)
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.engine = engine
+        self._commands = {"NEW": self._new, "PLAYER": self._player, "MOVE": self._move, "PASS": self._pass,
+                          "MOVES": self._moves, "BOARD": self._board, "TURN": self._turn, "COUNT": self._count,
+                          "CLOSE": self._close}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def evict_idle(self, now: float = None) -> int:
+        """Remove the games that have been idle for longer than idle_timeout
+        :param float now: the current time.monotonic() value
+        :return int: the number of games removed"""
+        if now is None:
+            now = time.monotonic()
+        expired = [key for key, session in self._sessions.items() if now - session.last_used > self.idle_timeout]
+        for key in expired:
+            del self._sessions[key]
+        return len(expired)
+
+    def handle(self, line: str) -> str:
+        """Run one request line and return its response line
+        :param str line: the request, without the line ending
+        :return str: the response, without the line ending"""
+        words = line.split()
+        if not words:
+            return "ERR Empty request"
+        command = self._commands.get(words[0].upper())
+        if command is None:
+            return f"ERR Unknown command {words[0]}"
+        try:
+            return command(words[1:])
+        except (KeyError, IndexError, ValueError) as error:
+            return f"ERR {error.args[0] if error.args else 'Bad request'}"
+
+    def _session(self, words: list) -> Session:
+        """Return the session named by the first argument of a request and mark it as used"""
+        if not words:
+            raise ValueError("Missing game id")
+        session = self._sessions.get(words[0])
+        if session is None:
+            raise KeyError(f"No game {words[0]}")
+        session.last_used = time.monotonic()
+        return session
+
+    @staticmethod
+    def _color(session: Session, color: str) -> str:
+        """Check that a color is the player to move in an unfinished game and return it in lower case"""
+        color = color.lower()
+        if color not in ("black", "white"):
+            raise ValueError('The color must be "white" or "black"')
+        if session.over:
+            raise ValueError("The game is over")
+        if color != session.turn:
+            raise ValueError(f"It is {session.turn}'s turn")
+        return color
+
+    @staticmethod
+    def _finish(session: Session) -> str:
+        """End a game and return its OVER response"""
+        session.over = True
+        black_count, white_count = session.game.return_winner_count()
+        players = session.game.get_players()
+        if black_count == white_count:
+            result = "It's a tie"
+        else:
+            winner = "black" if black_count > white_count else "white"
+            result = f"Winner is {winner} player: {players.get(winner, winner)}"
+        return f"OVER {black_count} {white_count} {result}"
+
+    def _new(self, words: list) -> str:
+        if len(self._sessions) >= self.max_sessions:
+            return "ERR Server is full"
+        game = Othello(engine=words[0] if words else self.engine)
+        session_id = str(next(self._ids))
+        self._sessions[session_id] = Session(session_id, game)
+        return f"OK {session_id}"
+
+    def _player(self, words: list) -> str:
+        session = self._session(words)
+        if len(words) != 3:
+            raise ValueError("Usage: PLAYER <id> <name> <color>")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            session.game.create_player(words[1], words[2].lower())
+        message = " ".join(output.getvalue().split())
+        return f"ERR {message}" if message else "OK"
+
+    def _move(self, words: list) -> str:
+        session = self._session(words)
+        if len(words) != 4:
+            raise ValueError("Usage: MOVE <id> <color> <x> <y>")
+        color = self._color(session, words[1])
+        if not (words[2].isdigit() and words[3].isdigit()):
+            raise ValueError("The coordinates must be whole numbers")
+        position = (int(words[2]), int(words[3]))
+        if not (0 <= position[0] <= 9 and 0 <= position[1] <= 9):
+            raise ValueError(f"Invalid move. Here are the valid moves: "
+                             f"{session.game.return_available_positions(color)}")
+        if not session.game.return_available_positions(color):
+            raise ValueError("There are no valid moves - send PASS")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = session.game.play_game(color, position)
+        if result is not None:
+            return f"ERR {' '.join(output.getvalue().split())}"
+        other = "white" if color == "black" else "black"
+        session.turn = other
+        if session.game.get_piece_counter() >= GAME_OVER_PIECES or not (
+                session.game.return_available_positions(other) or session.game.return_available_positions(color)):
+            return self._finish(session)
+        return "OK"
+
+    def _pass(self, words: list) -> str:
+        session = self._session(words)
+        if len(words) != 2:
+            raise ValueError("Usage: PASS <id> <color>")
+        color = self._color(session, words[1])
+        if session.game.return_available_positions(color):
+            raise ValueError("A player with a valid move can't pass")
+        other = "white" if color == "black" else "black"
+        session.turn = other
+        if not session.game.return_available_positions(other):
+            return self._finish(session)
+        return "OK"
+
+    def _moves(self, words: list) -> str:
+        session = self._session(words)
+        if len(words) != 2 or words[1].lower() not in ("black", "white"):
+            raise ValueError("Usage: MOVES <id> <color>")
+        moves = session.game.return_available_positions(words[1].lower())
+        return " ".join(["OK"] + [f"{x},{y}" for x, y in moves])
+
+    def _board(self, words: list) -> str:
+        game = self._session(words).game
+        rows = ["".join(SYMBOLS[game.get_tile(x, y)] for y in range(1, 9)) for x in range(1, 9)]
+        return "OK " + "/".join(rows)
+
+    def _turn(self, words: list) -> str:
+        session = self._session(words)
+        return "OVER" if session.over else f"OK {session.turn}"
+
+    def _count(self, words: list) -> str:
+        black_count, white_count = self._session(words).game.return_winner_count()
+        return f"OK {black_count} {white_count}"
+
+    def _close(self, words: list) -> str:
+        del self._sessions[self._session(words).session_id]
+        return "OK"
+
+
+class GameServer:
+    """Represents an asyncio server that serves a SessionManager on a TCP or Unix socket.
+    :param SessionManager manager: the hosted games - a new SessionManager by default
+    :param float evict_interval: seconds between sweeps for idle games
+    :param int line_limit: the longest request line accepted, in bytes
+    """
+    def __init__(self, manager: SessionManager = None, evict_interval: float = 10.0, line_limit: int = 1024):
+        self.manager = SessionManager() if manager is None else manager
+        self._evict_interval = evict_interval
+        self._line_limit = line_limit
+        self._server = None
+        self._evictor = None
+        self.connections = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: str = None):
+        """Start listening - on a Unix socket if path is given, otherwise on TCP
+        :param str host: the TCP host
+        :param int port: the TCP port (0 picks a free port)
+        :param str path: the Unix socket path
+        :return: the address the server listens on - the path or a (host, port) tuple"""
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._client, path, limit=self._line_limit)
+        else:
+            self._server = await asyncio.start_server(self._client, host, port, limit=self._line_limit)
+        self._evictor = asyncio.ensure_future(self._evict())
+        return self._server.sockets[0].getsockname()
+
+    async def close(self) -> None:
+        """Stop listening and stop evicting idle games
+        :return: None"""
+        self._evictor.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+        return
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled
+        :return: None"""
+        await self._server.serve_forever()
+        return
+
+    async def _evict(self) -> None:
+        """Sweep for idle games every evict_interval seconds"""
+        while True:
+            await asyncio.sleep(self._evict_interval)
+            self.manager.evict_idle()
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection until it sends QUIT or closes"""
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:                  # longer than line_limit - the stream can't be resynchronised
+                    writer.write(b"ERR Request too long\n")
+                    break
+                if not line:
+                    break
+                request = line.decode(errors="replace").strip()
+                if request.upper() == "QUIT":
+                    writer.write(b"OK\n")
+                    break
+                writer.write(self.manager.handle(request).encode() + b"\n")
+                await writer.drain()                # wait here while the client isn't reading its responses
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+        return
+
+
+def main():
+    """Run a server from the command line"""
+    parser = argparse.ArgumentParser(description="Serve Othello games over a line protocol.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument("--unix", default=None, help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--max-games", type=int, default=10000)
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="seconds before an idle game is evicted")
+    parser.add_argument("--engine", default="bitboard", choices=["tiles", "bitboard"])
+    args = parser.parse_args()
+
+    async def serve():
+        server = GameServer(SessionManager(args.max_games, args.idle_timeout, args.engine))
+        address = await server.start(args.host, args.port, args.unix)
+        print(f"Serving Othello on {address}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Tests that the bitboard engine plays exactly the same games as the Tile engine on the 8x8 board.
+
+"""Run with "python -m pytest"."""
+
+import random
+
+from bitboard import flip_mask, legal_moves
+from othello import Othello
+
+
+def play_both(seed: int) -> None:
+    """Play one random game on both engines, checking every board method after every move"""
+    rng = random.Random(seed)
+    tiles, bits = Othello(engine="tiles"), Othello(engine="bitboard")
+    color = "black"
+    passes = 0
+    while passes < 2 and tiles.get_piece_counter() < 62:
+        moves = tiles.return_available_positions(color)
+        assert moves == bits.return_available_positions(color)
+        if moves:
+            move = rng.choice(moves)
+            assert tiles.count_flips(color, move) == bits.count_flips(color, move)
+            tile_changed = tiles.make_move_delta(color, move)
+            bit_changed = bits.make_move_delta(color, move)
+            assert tile_changed[0] == bit_changed[0] and sorted(tile_changed) == sorted(bit_changed)
+            passes = 0
+        else:
+            passes += 1
+        assert tiles.board == bits.board
+        assert tiles.get_bitboards() == bits.get_bitboards()
+        assert tiles.return_winner_count() == bits.return_winner_count()
+        color = "white" if color == "black" else "black"
+
+
+def test_engines_play_the_same_games():
+    for seed in range(30):
+        play_both(seed)
+
+
+def test_unmake_move_restores_the_game():
+    for engine in ("tiles", "bitboard"):
+        rng = random.Random(7)
+        game = Othello(engine=engine)
+        color = "black"
+        for _ in range(40):
+            moves = game.return_available_positions(color)
+            if moves:
+                before = (game.board, game.get_bitboards(), game.return_available_positions("white"))
+                record = game.make_move_record(color, moves[-1])
+                game.unmake_move(record)
+                assert (game.board, game.get_bitboards(), game.return_available_positions("white")) == before
+                game.make_move_delta(color, rng.choice(moves))
+            color = "white" if color == "black" else "black"
+
+
+def perft(own: int, opp: int, depth: int, passed: bool = False) -> int:
+    """Count the leaf positions depth plies from a position (a pass counts as a ply)"""
+    if depth == 0:
+        return 1
+    moves = legal_moves(own, opp)
+    if not moves:
+        return 0 if passed else perft(opp, own, depth - 1, True)
+    total = 0
+    while moves:
+        low = moves & -moves
+        moves ^= low
+        flips = flip_mask(own, opp, low.bit_length() - 1)
+        total += perft(opp & ~flips, own | flips | low, depth - 1)
+    return total
+
+
+def test_perft():
+    black, white = Othello(engine="bitboard").get_bitboards()
+    assert [perft(black, white, depth) for depth in range(1, 7)] == [4, 12, 56, 244, 1396, 8160]
@@ -0,0 +1,74 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Tests the table-driven evaluator against a naive base-3 reference, a table file round trip and the
+#               NumPy batch scorer.
+
+"""Run with "python -m pytest".  The batch test is skipped when numpy is not installed."""
+
+import random
+
+import pytest
+
+from bitboard import FULL, legal_moves, neighbours
+from evaluator import PatternEvaluator, rotations
+from othello import Othello
+from search import SCORE_DISC
+
+
+def positions(count: int = 150) -> list:
+    """Return (black, white, color to move) positions from random games"""
+    rng = random.Random(5)
+    output = []
+    for _ in range(count):
+        game = Othello(engine="bitboard")
+        color = "black"
+        for _ in range(rng.randrange(5, 58)):
+            moves = game.return_available_positions(color)
+            if moves:
+                game.make_move_delta(color, rng.choice(moves))
+            color = "white" if color == "black" else "black"
+        black, white = game.get_bitboards()
+        output.append((black, white, int(color == "white")))
+    return output
+
+
+def naive(evaluator: PatternEvaluator, own: int, opp: int) -> int:
+    """Score a position by building every base-3 pattern index square by square"""
+    score = 0
+    for name, squares, table in evaluator.patterns:
+        for oriented in rotations(squares):
+            score += table[sum(3 ** k * (1 if own >> index & 1 else 2 if opp >> index & 1 else 0)
+                               for k, index in enumerate(oriented))]
+    score += evaluator.mobility * (legal_moves(own, opp).bit_count() - legal_moves(opp, own).bit_count())
+    edge = neighbours(~(own | opp) & FULL)
+    score -= evaluator.frontier * ((own & edge).bit_count() - (opp & edge).bit_count())
+    return max(-SCORE_DISC + 1, min(SCORE_DISC - 1, score))
+
+
+def test_matches_naive_reference():
+    evaluator = PatternEvaluator()
+    for black, white, color in positions():
+        own, opp = (white, black) if color else (black, white)
+        assert evaluator(own, opp) == naive(evaluator, own, opp)
+
+
+def test_table_file_round_trip(tmp_path):
+    evaluator = PatternEvaluator(mobility=7, frontier=3)
+    evaluator.save(tmp_path / "weights.oev")
+    loaded = PatternEvaluator.load(tmp_path / "weights.oev")
+    assert [(name, squares, list(table)) for name, squares, table in loaded.patterns] == \
+        [(name, squares, list(table)) for name, squares, table in evaluator.patterns]
+    for black, white, color in positions(30):
+        assert loaded(black, white) == evaluator(black, white)
+
+
+def test_batch_matches_scalar():
+    np = pytest.importorskip("numpy")
+    evaluator = PatternEvaluator()
+    boards = positions()
+    scores = evaluator.evaluate_batch(np.array([black for black, white, color in boards], dtype=np.uint64),
+                                      np.array([white for black, white, color in boards], dtype=np.uint64),
+                                      np.array([color for black, white, color in boards]))
+    assert [int(score) for score in scores] == \
+        [evaluator(*((white, black) if color else (black, white))) for black, white, color in boards]
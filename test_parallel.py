@@ -0,0 +1,66 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Tests that the deterministic parallel search returns the fixed-depth minimax score and the same
+#               result with any number of workers.
+
+"""Run with "python -m pytest"."""
+
+import random
+
+import pytest
+
+from bitboard import flip_mask, legal_moves
+from othello import Othello
+from parallel import ParallelSearch, ParallelSearchPolicy
+from search import Search
+
+
+def position(seed: int, plies: int) -> tuple:
+    """Return the black and white bitboards and color to move after random plies from the start"""
+    rng = random.Random(seed)
+    game = Othello(engine="bitboard")
+    color = "black"
+    for _ in range(plies):
+        moves = game.return_available_positions(color)
+        if moves:
+            game.make_move_delta(color, rng.choice(moves))
+        color = "white" if color == "black" else "black"
+    black, white = game.get_bitboards()
+    return black, white, int(color == "white")
+
+
+def root_score(black: int, white: int, color: int, depth: int) -> int:
+    """Return the best score of a position from a full-window fixed-depth search of every root move"""
+    own, opp = (white, black) if color else (black, white)
+    moves = legal_moves(own, opp)
+    best = None
+    while moves:
+        low = moves & -moves
+        moves ^= low
+        flips = flip_mask(own, opp, low.bit_length() - 1)
+        new_own, new_opp = own | flips | low, opp & ~flips
+        child = (new_opp, new_own) if color else (new_own, new_opp)
+        score = -Search(12, endgame_empties=0).score(child[0], child[1], 1 - color, depth - 1)
+        best = score if best is None else max(best, score)
+    return best
+
+
+def test_deterministic_search_matches_minimax():
+    with ParallelSearch(1, deterministic=True) as one, ParallelSearch(2, deterministic=True) as two:
+        for seed in range(4):
+            black, white, color = position(seed, 10 + seed * 3)
+            if not legal_moves(*((white, black) if color else (black, white))):
+                continue
+            result = one.best_move(black, white, color, 1.0, 3)
+            nodes = one.nodes
+            assert result == two.best_move(black, white, color, 1.0, 3)
+            assert nodes == two.nodes
+            assert result[1] == root_score(black, white, color, 3)
+
+
+def test_deterministic_needs_max_depth():
+    with pytest.raises(ValueError):
+        ParallelSearchPolicy(1.0, 1, deterministic=True)
+    with pytest.raises(ValueError):
+        ParallelSearch(1, deterministic=True).best_move(*position(0, 4), 1.0)
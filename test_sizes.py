@@ -0,0 +1,106 @@
+# Author: Joel Strong
+# GitHub username: jdstrongpdx
+# Date: 10/17/26
+# Description: Tests the board sizes of the Othello class: both engines against a naive move generator on every
+#               size, snapshot round trips, and the 8x8-only guards.
+
+"""Run with "python -m pytest"."""
+
+import random
+
+import pytest
+
+from bitboard import flip_mask, geometry, legal_moves
+from othello import SIZES, Othello
+from records import RecordWriter
+from search import SearchPolicy
+
+DIRECTIONS = [(1, 0), (1, 1), (0, 1), (-1, 1), (0, -1), (-1, -1), (-1, 0), (1, -1)]
+
+
+def naive_moves(game: Othello, color: str) -> list:
+    """Find the valid moves square by square with get_tile"""
+    own = 0 if color == "black" else 1
+    size = game.get_size()
+    output = []
+    for x in range(1, size + 1):
+        for y in range(1, size + 1):
+            if game.get_tile(x, y) != 2:
+                continue
+            for step_x, step_y in DIRECTIONS:
+                find_x, find_y, run = x + step_x, y + step_y, 0
+                while game.get_tile(find_x, find_y) == 1 - own:
+                    find_x, find_y, run = find_x + step_x, find_y + step_y, run + 1
+                if run and game.get_tile(find_x, find_y) == own:
+                    output.append((x, y))
+                    break
+    return output
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_engines_match_naive_moves(size):
+    for seed in range(3 if size < 16 else 1):
+        rng = random.Random(seed)
+        tiles, bits = Othello("tiles", size), Othello("bitboard", size)
+        color = "black"
+        passes = 0
+        while passes < 2 and tiles.get_piece_counter() < tiles.get_game_over_pieces():
+            moves = tiles.return_available_positions(color)
+            assert moves == bits.return_available_positions(color) == naive_moves(tiles, color)
+            if moves:
+                move = rng.choice(moves)
+                assert tiles.count_flips(color, move) == bits.count_flips(color, move)
+                tile_changed, bit_changed = tiles.make_move_delta(color, move), bits.make_move_delta(color, move)
+                assert tile_changed[0] == bit_changed[0] and sorted(tile_changed) == sorted(bit_changed)
+                passes = 0
+            else:
+                passes += 1
+            assert tiles.board == bits.board and tiles.get_bitboards() == bits.get_bitboards()
+            color = "white" if color == "black" else "black"
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("engine", ["tiles", "bitboard"])
+def test_snapshot_round_trip(size, engine):
+    rng = random.Random(size)
+    game = Othello(engine, size)
+    game.create_player("é" * 200, "black")
+    game.create_player("b", "white")
+    color = "black"
+    passes = 0
+    while passes < 2:                               # play past get_game_over_pieces to fill the board
+        moves = game.return_available_positions(color)
+        if moves:
+            game.make_move(color, rng.choice(moves))
+            passes = 0
+        else:
+            passes += 1
+        color = "white" if color == "black" else "black"
+    data = game.snapshot()
+    restored = Othello.from_snapshot(data)
+    assert restored.snapshot() == data
+    assert restored.get_size() == size and restored.board == game.board
+    assert restored.get_history() == game.get_history()
+    assert restored.get_piece_counter() == game.get_piece_counter()
+
+
+def test_generic_8x8_matches_unrolled():
+    layout = geometry(8)
+    rng = random.Random(1)
+    for _ in range(2000):
+        occupied = rng.getrandbits(64)
+        own = occupied & rng.getrandbits(64)
+        opp = occupied & ~own
+        index = rng.randrange(64)
+        assert layout._legal_moves(own, opp) == legal_moves(own, opp)
+        assert layout._flip_mask(own, opp, index) == flip_mask(own, opp, index)
+
+
+def test_8x8_only_features_reject_other_sizes(tmp_path):
+    game = Othello("bitboard", 10)
+    with pytest.raises(ValueError):
+        SearchPolicy(0.01)(game, "black", game.return_available_positions("black"))
+    with RecordWriter(tmp_path / "games.oth") as writer, pytest.raises(ValueError):
+        writer.write_game(game)
+    with pytest.raises(ValueError):
+        Othello(size=7)